@@ -0,0 +1,76 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks                       # run everything
+    python -m benchmarks -k "^matrix\\."        # only benchmarks matching a regex
+    python -m benchmarks --output results.json # save results as JSON
+    python -m benchmarks --save-baseline       # store results as the baseline
+
+Results are compared against the baseline (benchmarks/baseline.json by
+default) if it exists, and the exit status is 1 if any benchmark got slower
+than the threshold allows.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from . import bench_canvas, bench_matrix, bench_ray, bench_render, bench_vector  # noqa
+from .suite import compare, load, print_result, regressions, run, save, select
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks matching")
+    parser.add_argument("--repeat", type=int, help="override the repeat count")
+    parser.add_argument(
+        "--number", type=int, help="calls per timing (default: chosen automatically)"
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="write results to the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fractional slowdown counted as a regression (default: 0.1)",
+    )
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    selected = select(args.pattern)
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return 0
+
+    results = run(selected, args.repeat, report=print_result, number=args.number)
+    if args.output:
+        save(results, args.output)
+    if args.save_baseline:
+        save(results, args.baseline)
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    changes = compare(results, load(args.baseline))
+    print(f"\nCompared with {args.baseline}:")
+    for change in changes:
+        print(f"{change.name:<40} {change.ratio:6.2f}x")
+    slower = regressions(changes, args.threshold)
+    if slower:
+        print(f"\n{len(slower)} regression(s) over {args.threshold:.0%}:")
+        for change in slower:
+            print(f"  {change.name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
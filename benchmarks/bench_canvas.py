@@ -0,0 +1,49 @@
+import io
+import random
+
+from raycaster.canvas import Canvas
+from raycaster.vector import Colour
+
+from .suite import benchmark
+
+SIZE = 100
+
+
+def random_canvas(size: int) -> Canvas:
+    random.seed(0)
+    c = Canvas(size, size)
+    for y in range(size):
+        c.write_row(
+            y, (Colour(random.random(), random.random(), 1.2) for _ in range(size))
+        )
+    return c
+
+
+@benchmark("canvas.write")
+def write():
+    c, colour = Canvas(SIZE, SIZE), Colour(0.1, 0.2, 0.3)
+    return lambda: c.write(50, 50, colour)
+
+
+@benchmark("canvas.get")
+def get():
+    c = random_canvas(SIZE)
+    return lambda: c.get(50, 50)
+
+
+@benchmark(f"canvas.write_rect_{SIZE}")
+def write_rect():
+    c = Canvas(SIZE, SIZE)
+    colours = [Colour(0.1, 0.2, 0.3)] * (SIZE * SIZE)
+    return lambda: c.write_rect(0, 0, SIZE, SIZE, colours)
+
+
+@benchmark(f"canvas.as_ppm_string_{SIZE}")
+def as_ppm_string():
+    return random_canvas(SIZE).as_ppm_string
+
+
+@benchmark(f"canvas.write_ppm_p6_{SIZE}")
+def write_ppm_p6():
+    c = random_canvas(SIZE)
+    return lambda: c.write_ppm(io.BytesIO(), format="p6")
@@ -0,0 +1,165 @@
+"""
+Matrix benchmarks.
+
+Besides registering benchmarks for the suite, this compares the current matrix
+code against reference implementations when run from the repository root:
+
+    python -m benchmarks.bench_matrix [rays]
+"""
+import random
+import sys
+import timeit
+
+from raycaster.matrix import AffineMatrix, Matrix
+from raycaster.ray import Ray
+from raycaster.transformation import rotation_y, scaling, translation
+from raycaster.vector import Tuple, point, vector
+
+from .suite import benchmark
+
+NUMBER = 2000
+
+
+def reference_determinant(m: Matrix) -> float:
+    """The recursive cofactor expansion that Matrix.determinant replaced."""
+    if m.size == 2:
+        return m.data[0] * m.data[3] - m.data[1] * m.data[2]
+    return sum(
+        reference_determinant(m.submatrix(0, pos)) * el * (-1 if pos % 2 else 1)
+        for pos, el in enumerate(m[0])
+    )
+
+
+def reference_inverse(m: Matrix) -> Matrix:
+    """The cofactor/adjugate inverse that Matrix.inverse replaced."""
+    det = reference_determinant(m)
+    new_data = []
+    for row in range(m.size):
+        for col in range(m.size):
+            minor = reference_determinant(m.submatrix(row, col))
+            new_data.append(minor * (-1 if (row + col) % 2 else 1) / det)
+    return Matrix(new_data).transpose()
+
+
+def reference_multiply(m: Matrix, t: Tuple) -> Tuple:
+    """The __getitem__ based Matrix * Tuple product that Matrix.__mul__ replaced."""
+    return Tuple(
+        sum(a * b for a, b in zip(m[0], t)),
+        sum(a * b for a, b in zip(m[1], t)),
+        sum(a * b for a, b in zip(m[2], t)),
+        sum(a * b for a, b in zip(m[3], t)),
+    )
+
+
+def random_matrix(size: int) -> Matrix:
+    return Matrix(random.uniform(-10, 10) for _ in range(size * size))
+
+
+def transform_matrix() -> Matrix:
+    # A plain Matrix, so FrozenMatrix memoisation doesn't skew the timings.
+    return Matrix(
+        list((translation(1, 2, 3) * rotation_y(0.5) * scaling(2, 2, 2)).data)
+    )
+
+
+def compare(name: str, size: int, new, old, number: int) -> None:
+    m = random_matrix(size)
+    new_time = timeit.timeit(lambda: new(m), number=number)
+    old_time = timeit.timeit(lambda: old(m), number=number)
+    print(
+        f"{name} {size}x{size}: {new_time / number * 1e6:9.2f}us "
+        f"(was {old_time / number * 1e6:9.2f}us, {old_time / new_time:6.1f}x faster)"
+    )
+
+
+def compare_ray_transform(count: int) -> None:
+    t = translation(1, 2, 3) * rotation_y(0.5) * scaling(2, 2, 2)
+    rays = [
+        Ray(point(random.random(), random.random(), -5), vector(0, 0, 1))
+        for _ in range(count)
+    ]
+    new_time = timeit.timeit(lambda: [r.transform(t) for r in rays], number=1)
+    old_time = timeit.timeit(
+        lambda: [
+            Ray(reference_multiply(t, r.origin), reference_multiply(t, r.direction))
+            for r in rays
+        ],
+        number=1,
+    )
+    print(
+        f"transform {count} rays: {new_time:.2f}s "
+        f"(was {old_time:.2f}s, {old_time / new_time:.1f}x faster)"
+    )
+
+
+def compare_affine(number: int) -> None:
+    m = transform_matrix()
+    a = AffineMatrix.from_matrix(m)
+    for name, affine, full in (
+        ("multiply", lambda: a * a, lambda: m * m),
+        ("inverse ", a.inverse, m.inverse),
+    ):
+        affine_time = timeit.timeit(affine, number=number)
+        full_time = timeit.timeit(full, number=number)
+        print(
+            f"affine {name}: {affine_time / number * 1e6:6.2f}us "
+            f"(4x4 {full_time / number * 1e6:6.2f}us)"
+        )
+
+
+@benchmark("matrix.multiply")
+def multiply():
+    a, b = transform_matrix(), random_matrix(4)
+    return lambda: a * b
+
+
+@benchmark("matrix.multiply_tuple")
+def multiply_tuple():
+    m, p = transform_matrix(), point(1, 2, 3)
+    return lambda: m * p
+
+
+@benchmark("matrix.transform_point")
+def transform_point():
+    m, p = transform_matrix(), point(1, 2, 3)
+    return lambda: m.transform_point(p)
+
+
+@benchmark("matrix.determinant")
+def determinant():
+    return random_matrix(4).determinant
+
+
+@benchmark("matrix.inverse")
+def inverse():
+    return random_matrix(4).inverse
+
+
+@benchmark("matrix.transpose")
+def transpose():
+    return random_matrix(4).transpose
+
+
+@benchmark("matrix.affine_inverse")
+def affine_inverse():
+    return AffineMatrix.from_matrix(transform_matrix()).inverse
+
+
+@benchmark("matrix.apply_points_1000")
+def apply_points():
+    m = transform_matrix()
+    points = [random.random() for _ in range(3000)]
+    return lambda: m.apply_points(points)
+
+
+def main() -> None:
+    random.seed(0)
+    compare_ray_transform(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    for size, number in ((4, NUMBER), (5, NUMBER // 10), (6, NUMBER // 100)):
+        compare("determinant", size, Matrix.determinant, reference_determinant, number)
+        compare("inverse    ", size, Matrix.inverse, reference_inverse, number)
+    compare_affine(NUMBER * 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import random
+
+from raycaster.ray import Ray, RayBundle, Sphere
+from raycaster.transformation import rotation_y, scaling, shearing, translation
+from raycaster.vector import point, vector
+from raycaster.world import World
+
+from .suite import benchmark
+
+SIZE = 1000
+
+
+def sheared_sphere() -> Sphere:
+    s = Sphere()
+    s.set_transform(shearing(0.5, 0, 0, 0, 0, 0.3))
+    return s
+
+
+@benchmark("ray.intersect_hit")
+def intersect_hit():
+    s, r = sheared_sphere(), Ray(point(0, 0, -5), vector(0, 0, 1))
+    return lambda: r.intersect(s)
+
+
+@benchmark("ray.intersect_miss")
+def intersect_miss():
+    s, r = sheared_sphere(), Ray(point(0, 3, -5), vector(0, 0, 1))
+    return lambda: r.intersect(s)
+
+
+@benchmark("ray.nearest_hit")
+def nearest_hit():
+    s, r = sheared_sphere(), Ray(point(0, 0, -5), vector(0, 0, 1))
+    return lambda: r.nearest_hit(s)
+
+
+@benchmark("ray.transform")
+def transform():
+    t = translation(1, 2, 3) * rotation_y(0.5) * scaling(2, 2, 2)
+    r = Ray(point(0, 0, -5), vector(0, 0, 1))
+    return lambda: r.transform(t)
+
+
+@benchmark(f"ray.bundle_intersect_{SIZE}")
+def bundle_intersect():
+    random.seed(0)
+    bundle = RayBundle.from_rays(
+        Ray(point(random.uniform(-2, 2), random.uniform(-2, 2), -5), vector(0, 0, 1))
+        for _ in range(SIZE)
+    )
+    s = sheared_sphere()
+    return lambda: bundle.intersect(s)
+
+
+@benchmark("world.nearest_hit_500")
+def world_nearest_hit():
+    random.seed(0)
+    world = World()
+    for _ in range(500):
+        s = Sphere()
+        s.set_transform(
+            translation(*(random.uniform(-20, 20) for _ in range(3)))
+            * scaling(0.5, 0.5, 0.5)
+        )
+        world.add(s)
+    rays = [
+        Ray(point(0, 0, -30), vector(random.uniform(-1, 1), random.uniform(-1, 1), 2))
+        for _ in range(100)
+    ]
+    # The BVH is built lazily on first use, which shouldn't be timed.
+    world.nearest_hit(rays[0])
+    return lambda: [world.nearest_hit(r) for r in rays]
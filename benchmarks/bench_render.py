@@ -0,0 +1,15 @@
+from examples.cast import cast
+
+from .suite import benchmark
+
+SIZES = (50, 100, 200)
+
+
+def register(size: int) -> None:
+    @benchmark(f"render.cast_{size}", repeat=3)
+    def render():
+        return lambda: cast(size)
+
+
+for size in SIZES:
+    register(size)
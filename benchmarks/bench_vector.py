@@ -0,0 +1,66 @@
+from raycaster.vector import Colour, TupleArray, lerp, madd, point, vector
+
+from .suite import benchmark
+
+SIZE = 1000
+
+
+@benchmark("vector.add")
+def add():
+    a, b = point(1, 2, 3), vector(4, 5, 6)
+    return lambda: a + b
+
+
+@benchmark("vector.mul_scalar")
+def mul_scalar():
+    a = vector(1, 2, 3)
+    return lambda: a * 2.5
+
+
+@benchmark("vector.dot")
+def dot():
+    a, b = vector(1, 2, 3), vector(4, 5, 6)
+    return lambda: a.dot(b)
+
+
+@benchmark("vector.cross")
+def cross():
+    a, b = vector(1, 2, 3), vector(4, 5, 6)
+    return lambda: a.cross(b)
+
+
+@benchmark("vector.normalize")
+def normalize():
+    a = vector(1, 2, 3)
+    return a.normalize
+
+
+@benchmark("vector.madd")
+def fused_madd():
+    a, b = point(1, 2, 3), vector(4, 5, 6)
+    return lambda: madd(a, b, 2.5)
+
+
+@benchmark("vector.lerp")
+def fused_lerp():
+    a, b = Colour(1, 0.5, 0), Colour(0, 0.5, 1)
+    return lambda: lerp(a, b, 0.25)
+
+
+@benchmark("vector.colour_hadamard")
+def hadamard():
+    a, b = Colour(1, 0.2, 0.4), Colour(0.9, 1, 0.1)
+    return lambda: a * b
+
+
+@benchmark(f"vector.array_add_{SIZE}")
+def array_add():
+    a = TupleArray.from_tuples(point(i, i, i) for i in range(SIZE))
+    b = TupleArray.from_tuples(vector(1, 2, 3) for _ in range(SIZE))
+    return lambda: a + b
+
+
+@benchmark(f"vector.array_normalize_{SIZE}")
+def array_normalize():
+    a = TupleArray.from_tuples(vector(i + 1, 2, 3) for i in range(SIZE))
+    return a.normalize
@@ -0,0 +1,156 @@
+"""
+A small benchmark harness.
+
+Benchmarks are registered with @benchmark and run with `python -m benchmarks`.
+Results can be saved as JSON and compared against a stored baseline.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Iterable, NamedTuple
+
+from raycaster.backend import get_backend
+
+Setup = Callable[[], Callable[[], object]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup
+    repeat: int
+
+
+class Result(NamedTuple):
+    name: str
+    best: float
+    mean: float
+    number: int
+    repeat: int
+
+
+class Change(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+benchmarks: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, repeat: int = 5) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark.
+
+    The decorated function does any setup and returns the callable to time, so
+    setup cost is not included in the result.
+    """
+
+    def decorator(setup: Setup) -> Setup:
+        if name in benchmarks:
+            raise ValueError(f"Duplicate benchmark {name!r}")
+        benchmarks[name] = Benchmark(name, setup, repeat)
+        return setup
+
+    return decorator
+
+
+def measure(
+    bench: Benchmark, repeat: int | None = None, number: int | None = None
+) -> Result:
+    """
+    Time a benchmark, returning the best and mean seconds per call.
+
+    Each timing makes `number` calls, chosen with timeit's autorange by default.
+    """
+    timer = timeit.Timer(bench.setup())
+    if number is None:
+        number, _ = timer.autorange()
+    repeat = bench.repeat if repeat is None else repeat
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return Result(bench.name, min(times), statistics.mean(times), number, repeat)
+
+
+def select(pattern: str | None = None) -> list[Benchmark]:
+    if pattern is None:
+        return list(benchmarks.values())
+    return [b for b in benchmarks.values() if re.search(pattern, b.name)]
+
+
+def run(
+    selected: Iterable[Benchmark],
+    repeat: int | None = None,
+    report: Callable[[Result], None] | None = None,
+    number: int | None = None,
+) -> list[Result]:
+    results = []
+    for bench in selected:
+        result = measure(bench, repeat, number)
+        if report is not None:
+            report(result)
+        results.append(result)
+    return results
+
+
+def metadata() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "backend": get_backend().name,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save(results: list[Result], path: str | os.PathLike) -> None:
+    data = {
+        "metadata": metadata(),
+        "results": {r.name: r._asdict() for r in results},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load(path: str | os.PathLike) -> dict[str, float]:
+    """Load the best time per call of each benchmark in a results file."""
+    with open(path) as f:
+        data = json.load(f)
+    return {name: r["best"] for name, r in data["results"].items()}
+
+
+def compare(results: list[Result], baseline: dict[str, float]) -> list[Change]:
+    """Compare results with a baseline, skipping benchmarks it doesn't have."""
+    return [
+        Change(r.name, baseline[r.name], r.best) for r in results if r.name in baseline
+    ]
+
+
+def regressions(changes: list[Change], threshold: float) -> list[Change]:
+    """Return the changes that are more than `threshold` (e.g. 0.1) slower."""
+    return [c for c in changes if c.ratio > 1 + threshold]
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f}{unit}"
+    return f"{seconds / 1e-9:7.2f}ns"
+
+
+def print_result(result: Result, file=sys.stdout) -> None:
+    print(
+        f"{result.name:<40} {format_time(result.best)} "
+        f"(mean {format_time(result.mean)}, {result.repeat}x{result.number})",
+        file=file,
+    )
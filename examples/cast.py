@@ -1,43 +1,40 @@
+import math
 from pathlib import Path
 
+from raycaster.camera import Camera
 from raycaster.canvas import Canvas
-from raycaster.ray import Ray, Sphere
-from raycaster.transformation import shearing
-from raycaster.vector import Colour, point
+from raycaster.ray import Sphere
+from raycaster.transformation import shearing, view_transform
+from raycaster.vector import Colour, point, vector
 
 FILE_DIR = Path(__file__).parent.parent / "renders"
-FILE_DIR.mkdir(exist_ok=True)
 
 
-def main() -> None:
-    size = 500
-    print("Creating canvas...")
+def cast(size: int) -> Canvas:
     c = Canvas(size, size)
-    print("Canvas created")
     s = Sphere()
     t = shearing(0.5, 0, 0, 0, 0, 0.3)
     s.set_transform(t)
 
-    ray_origin = point(0, 0, -5)
+    # Looking from z=-5 at a 7 unit wide wall placed at z=10.
     wall_z = 10
     wall_size = 7
-    pixel_size = wall_size / size
+    camera = Camera(size, size, 2 * math.atan((wall_size / 2) / (wall_z + 5)))
+    camera.transform = view_transform(point(0, 0, -5), point(0, 0, 0), vector(0, 1, 0))
+
+    for x, y, ray in camera.rays():
+        hit = ray.nearest_hit(s)
+        if hit is not None:
+            col = Colour(50, hit[0] * 10 % 1, 50)
+            c.write(x, y, col)
+    return c
 
+
+def main() -> None:
     print("Rendering...")
-    for x in range(size):
-        for y in range(size):
-            wy = -(wall_size / 2) + pixel_size * x
-            wx = -(wall_size / 2) + pixel_size * y
-
-            pos = point(wx, wy, wall_z)
-
-            ray = Ray(ray_origin, (pos - ray_origin).normalize())
-            ray = ray.transform(s.transform)
-            xs = ray.intersect(s)
-            if xs.count > 0:
-                col = Colour(50, abs(xs.hit().t) * 10 % 1, 50)
-                c.write(x, y, col)
+    c = cast(500)
     print("Saving...")
+    FILE_DIR.mkdir(exist_ok=True)
     c.save_ppm(FILE_DIR / "2d_cast.ppm")
     print("Done!")
 
@@ -27,14 +27,16 @@ def main() -> None:
 
     canvas = Canvas(1000, 500)
 
-    while proj.position.y >= 0:
-        position = proj.position + proj.velocity
-        velocity = proj.velocity + env.gravity + env.wind
-        proj = Projectile(position, velocity)
+    # Step the projectile in place rather than allocating new tuples every tick.
+    position, velocity = proj
+    while position.y >= 0:
+        position += velocity
+        velocity += env.gravity
+        velocity += env.wind
         with contextlib.suppress(IndexError):
             canvas.write(
-                int(proj.position.x),
-                canvas.height - int(proj.position.y),
+                int(position.x),
+                canvas.height - int(position.y),
                 Colour(1, 0, 0),
             )
 
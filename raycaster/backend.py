@@ -0,0 +1,288 @@
+"""
+Compute backends for batch operations.
+
+The pure Python backend is always available. The NumPy backend is only
+imported when it is selected, either with set_backend("numpy") or by setting
+the RAYCASTER_BACKEND environment variable before first use.
+
+Backends take and return flat array("d") buffers, so callers get the same
+types whichever backend is active. Functions given NumPy arrays, such as
+Matrix.apply_points and intersect_many, always compute with NumPy directly
+instead, since the caller already depends on it.
+"""
+from __future__ import annotations
+
+import contextlib
+import itertools
+import math
+import operator
+import os
+from array import array
+from typing import Callable, Iterator, Sequence
+
+ENV_VAR = "RAYCASTER_BACKEND"
+DEFAULT_BACKEND = "python"
+
+Floats = Sequence[float]
+
+
+class PythonBackend:
+    """The pure Python backend, and the base class for other backends."""
+
+    name = "python"
+
+    _ops = {
+        "add": operator.add,
+        "sub": operator.sub,
+        "mul": operator.mul,
+        "truediv": operator.truediv,
+    }
+
+    def binary(self, op: str, a: Floats, b: Floats | float) -> array:
+        """Apply +, -, * or / elementwise, to another buffer or a scalar."""
+        other = itertools.repeat(b) if isinstance(b, (int, float)) else b
+        return array("d", map(self._ops[op], a, other))
+
+    def scale4(self, op: str, a: Floats, scalars: Floats) -> array:
+        """Multiply (op="mul") or divide each xyzw quad by its own scalar."""
+        f = self._ops[op]
+        return array("d", map(f, a, (s for s in scalars for _ in range(4))))
+
+    def dot4(self, a: Floats, b: Floats) -> array:
+        """Dot product of each pair of xyzw quads."""
+        products = map(operator.mul, a, b)
+        return array("d", (p + q + r + s for p, q, r, s in _groups(products, 4)))
+
+    def magnitude3(self, a: Floats, stride: int = 4) -> array:
+        """Length of the xyz part of each group of `stride` values."""
+        return array(
+            "d",
+            (
+                math.sqrt(g[0] * g[0] + g[1] * g[1] + g[2] * g[2])
+                for g in _groups(a, stride)
+            ),
+        )
+
+    def cross3(self, a: Floats, b: Floats) -> array:
+        """Cross product of each pair of xyzw quads, with w set to 0."""
+        out = array("d")
+        for (ax, ay, az, _), (bx, by, bz, _) in zip(_groups(a, 4), _groups(b, 4)):
+            out.extend((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx, 0.0))
+        return out
+
+    def normalize3(self, a: Floats) -> array:
+        """Scale each xyz triple to unit length."""
+        out = array("d", a)
+        for i in range(0, len(out), 3):
+            total = (out[i] ** 2 + out[i + 1] ** 2 + out[i + 2] ** 2) ** 0.5
+            out[i] /= total
+            out[i + 1] /= total
+            out[i + 2] /= total
+        return out
+
+    def transform(self, m: Floats, a: Floats, w: int) -> array:
+        """Multiply flat xyz points (w=1) or vectors (w=0) by an affine 4x4."""
+        m0, m1, m2, m3, m4, m5, m6, m7, m8, m9, m10, m11 = m[:12]
+        if not w:
+            m3 = m7 = m11 = 0.0
+        out = array("d", a)
+        for i in range(0, len(out), 3):
+            x, y, z = out[i], out[i + 1], out[i + 2]
+            out[i] = m0 * x + m1 * y + m2 * z + m3
+            out[i + 1] = m4 * x + m5 * y + m6 * z + m7
+            out[i + 2] = m8 * x + m9 * y + m10 * z + m11
+        return out
+
+    def intersect_spheres(
+        self, inverse: Floats, origins: Floats, directions: Floats
+    ) -> tuple[array, array, array]:
+        """
+        Intersect flat xyz rays with a unit sphere behind an inverse transform.
+
+        Returns the near and far t for each ray (NaN for misses) and a hit mask.
+        """
+        o = self.transform(inverse, origins, 1)
+        d = self.transform(inverse, directions, 0)
+        n = len(o) // 3
+        t0 = array("d", [math.nan]) * n
+        t1 = array("d", [math.nan]) * n
+        hit = array("b", bytes(n))
+        for r in range(n):
+            i = r * 3
+            ox, oy, oz = o[i], o[i + 1], o[i + 2]
+            dx, dy, dz = d[i], d[i + 1], d[i + 2]
+            a = dx * dx + dy * dy + dz * dz
+            b = 2 * (dx * ox + dy * oy + dz * oz)
+            c = ox * ox + oy * oy + oz * oz - 1
+            discrim = b * b - 4 * a * c
+            if discrim < 0:
+                continue
+            root = discrim**0.5
+            t0[r] = (-b - root) / (2 * a)
+            t1[r] = (-b + root) / (2 * a)
+            hit[r] = 1
+        return t0, t1, hit
+
+    def quantize(self, a: Floats) -> bytes:
+        """Clamp colour channels to [0, 1] and scale them to bytes."""
+        return bytes(round((0 if v <= 0 else 1 if v >= 1 else v) * 255) for v in a)
+
+
+class NumpyBackend(PythonBackend):
+    name = "numpy"
+
+    def __init__(self) -> None:
+        import numpy
+
+        self.np = numpy
+        self._ops = {
+            "add": numpy.add,
+            "sub": numpy.subtract,
+            "mul": numpy.multiply,
+            "truediv": numpy.true_divide,
+        }
+
+    def _in(self, a: Floats, width: int = 1):
+        return self.np.asarray(a, dtype=self.np.float64).reshape(-1, width)
+
+    def _out(self, result) -> array:
+        out = array("d")
+        out.frombytes(self.np.asarray(result, dtype=self.np.float64).tobytes())
+        return out
+
+    def _check_divisor(self, divisor) -> None:
+        # NumPy would return inf or NaN with a warning. Raise like Python does.
+        if not self.np.all(divisor):
+            raise ZeroDivisionError("float division by zero")
+
+    def binary(self, op: str, a: Floats, b: Floats | float) -> array:
+        other = b if isinstance(b, (int, float)) else self._in(b)
+        if op == "truediv":
+            self._check_divisor(other)
+        return self._out(self._ops[op](self._in(a), other))
+
+    def scale4(self, op: str, a: Floats, scalars: Floats) -> array:
+        scalars = self._in(scalars)
+        if op == "truediv":
+            self._check_divisor(scalars)
+        return self._out(self._ops[op](self._in(a, 4), scalars))
+
+    # The column arithmetic below follows the Python backend's order of
+    # operations rather than using einsum or matmul, so results match closely.
+
+    def dot4(self, a: Floats, b: Floats) -> array:
+        a, b = self._in(a, 4), self._in(b, 4)
+        return self._out(
+            a[:, 0] * b[:, 0]
+            + a[:, 1] * b[:, 1]
+            + a[:, 2] * b[:, 2]
+            + a[:, 3] * b[:, 3]
+        )
+
+    def magnitude3(self, a: Floats, stride: int = 4) -> array:
+        a = self._in(a, stride)
+        return self._out(
+            self.np.sqrt(a[:, 0] * a[:, 0] + a[:, 1] * a[:, 1] + a[:, 2] * a[:, 2])
+        )
+
+    def cross3(self, a: Floats, b: Floats) -> array:
+        a, b = self._in(a, 4), self._in(b, 4)
+        out = self.np.zeros_like(a)
+        out[:, 0] = a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1]
+        out[:, 1] = a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2]
+        out[:, 2] = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+        return self._out(out)
+
+    def normalize3(self, a: Floats) -> array:
+        a = self._in(a, 3)
+        total = self.np.sqrt(a[:, 0] ** 2 + a[:, 1] ** 2 + a[:, 2] ** 2)
+        self._check_divisor(total)
+        return self._out(a / total[:, None])
+
+    def _transform(self, m: Floats, a: Floats, w: int):
+        a = self._in(a, 3)
+        m = self.np.asarray(m[:12], dtype=self.np.float64).reshape(3, 4)
+        out = a[:, 0:1] * m[:, 0] + a[:, 1:2] * m[:, 1] + a[:, 2:3] * m[:, 2]
+        if w:
+            out += m[:, 3]
+        return out
+
+    def transform(self, m: Floats, a: Floats, w: int) -> array:
+        return self._out(self._transform(m, a, w))
+
+    def _intersect_spheres(self, inverse: Floats, origins: Floats, directions: Floats):
+        np = self.np
+        o = self._transform(inverse, origins, 1)
+        d = self._transform(inverse, directions, 0)
+        a = d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1] + d[:, 2] * d[:, 2]
+        b = 2 * (d[:, 0] * o[:, 0] + d[:, 1] * o[:, 1] + d[:, 2] * o[:, 2])
+        c = o[:, 0] * o[:, 0] + o[:, 1] * o[:, 1] + o[:, 2] * o[:, 2] - 1
+        discrim = b * b - 4 * a * c
+        hit = discrim >= 0
+        self._check_divisor(a[hit])
+        with np.errstate(invalid="ignore"):
+            root = np.sqrt(np.where(hit, discrim, np.nan))
+            t0 = (-b - root) / (2 * a)
+            t1 = (-b + root) / (2 * a)
+        return t0, t1, hit
+
+    def intersect_spheres(
+        self, inverse: Floats, origins: Floats, directions: Floats
+    ) -> tuple[array, array, array]:
+        t0, t1, hit = self._intersect_spheres(inverse, origins, directions)
+        hit_flags = array("b", hit.astype(self.np.int8).tobytes())
+        return self._out(t0), self._out(t1), hit_flags
+
+    def quantize(self, a: Floats) -> bytes:
+        a = self.np.asarray(a, dtype=self.np.float64)
+        return self.np.rint(self.np.clip(a, 0, 1) * 255).astype(self.np.uint8).tobytes()
+
+
+def _groups(values, n: int) -> Iterator[tuple[float, ...]]:
+    it = iter(values)
+    return zip(*[it] * n)
+
+
+Backend = PythonBackend
+
+_factories: dict[str, Callable[[], Backend]] = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+}
+_current: Backend | None = None
+
+
+def register_backend(name: str, factory: Callable[[], Backend]) -> None:
+    _factories[name] = factory
+
+
+def available_backends() -> list[str]:
+    return list(_factories)
+
+
+def set_backend(name: str) -> Backend:
+    """Select the backend used for batch operations from now on."""
+    global _current
+    try:
+        factory = _factories[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}") from None
+    _current = factory()
+    return _current
+
+
+def get_backend() -> Backend:
+    if _current is None:
+        return set_backend(os.environ.get(ENV_VAR, DEFAULT_BACKEND))
+    return _current
+
+
+@contextlib.contextmanager
+def use_backend(name: str) -> Iterator[Backend]:
+    """Temporarily select a backend."""
+    global _current
+    previous = _current
+    try:
+        yield set_backend(name)
+    finally:
+        _current = previous
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+from itertools import product
+
+from .matrix import Matrix
+from .vector import Tuple, point
+
+
+class Bounds:
+    """An axis-aligned bounding box."""
+
+    __slots__ = ("min_x", "min_y", "min_z", "max_x", "max_y", "max_z")
+
+    def __init__(
+        self,
+        min_x: float = math.inf,
+        min_y: float = math.inf,
+        min_z: float = math.inf,
+        max_x: float = -math.inf,
+        max_y: float = -math.inf,
+        max_z: float = -math.inf,
+    ) -> None:
+        self.min_x = min_x
+        self.min_y = min_y
+        self.min_z = min_z
+        self.max_x = max_x
+        self.max_y = max_y
+        self.max_z = max_z
+
+    @property
+    def minimum(self) -> Tuple:
+        return point(self.min_x, self.min_y, self.min_z)
+
+    @property
+    def maximum(self) -> Tuple:
+        return point(self.max_x, self.max_y, self.max_z)
+
+    def is_empty(self) -> bool:
+        return self.min_x > self.max_x
+
+    def centre(self) -> Tuple:
+        return point(
+            (self.min_x + self.max_x) / 2,
+            (self.min_y + self.max_y) / 2,
+            (self.min_z + self.max_z) / 2,
+        )
+
+    def add_point(self, x: float, y: float, z: float) -> None:
+        """Grow the box in place to contain a point."""
+        self.min_x = min(self.min_x, x)
+        self.min_y = min(self.min_y, y)
+        self.min_z = min(self.min_z, z)
+        self.max_x = max(self.max_x, x)
+        self.max_y = max(self.max_y, y)
+        self.max_z = max(self.max_z, z)
+
+    def union(self, other: Bounds) -> Bounds:
+        return Bounds(
+            min(self.min_x, other.min_x),
+            min(self.min_y, other.min_y),
+            min(self.min_z, other.min_z),
+            max(self.max_x, other.max_x),
+            max(self.max_y, other.max_y),
+            max(self.max_z, other.max_z),
+        )
+
+    def surface_area(self) -> float:
+        if self.is_empty():
+            return 0.0
+        dx = self.max_x - self.min_x
+        dy = self.max_y - self.min_y
+        dz = self.max_z - self.min_z
+        return 2 * (dx * dy + dy * dz + dz * dx)
+
+    def transform(self, t: Matrix) -> Bounds:
+        """Returns the box containing all eight corners of this one after `t`."""
+        new = Bounds()
+        for x, y, z in product(
+            (self.min_x, self.max_x),
+            (self.min_y, self.max_y),
+            (self.min_z, self.max_z),
+        ):
+            p = t.transform_point(point(x, y, z))
+            new.add_point(p.x, p.y, p.z)
+        return new
+
+    def hit_range(
+        self,
+        origin: Tuple,
+        inv_direction: tuple[float, float, float],
+        t_min: float = -math.inf,
+        t_max: float = math.inf,
+    ) -> tuple[float, float] | None:
+        """
+        Slab test a ray against the box.
+
+        `inv_direction` is the reciprocal of each direction component (infinite
+        where it is zero). Returns the overlap of the ray's [t_min, t_max] with
+        the box, or None if they do not meet.
+        """
+        for o, inv, lo, hi in (
+            (origin.x, inv_direction[0], self.min_x, self.max_x),
+            (origin.y, inv_direction[1], self.min_y, self.max_y),
+            (origin.z, inv_direction[2], self.min_z, self.max_z),
+        ):
+            if math.isinf(inv):
+                # Parallel to this slab, so it is either always or never inside.
+                if not lo <= o <= hi:
+                    return None
+                continue
+            t0 = (lo - o) * inv
+            t1 = (hi - o) * inv
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_min = max(t_min, t0)
+            t_max = min(t_max, t1)
+            if t_min > t_max:
+                return None
+        return t_min, t_max
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, self.__class__):
+            return all(
+                math.isclose(getattr(self, a), getattr(other, a), abs_tol=1e-10)
+                for a in self.__slots__
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"Bounds(({self.min_x:.2f}, {self.min_y:.2f}, {self.min_z:.2f}), "
+            f"({self.max_x:.2f}, {self.max_y:.2f}, {self.max_z:.2f}))"
+        )
+
+
+def inverse_direction(direction: Tuple) -> tuple[float, float, float]:
+    return tuple(  # type: ignore
+        1 / d if d else math.copysign(math.inf, d)
+        for d in (direction.x, direction.y, direction.z)
+    )
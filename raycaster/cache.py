@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, TypeVar
+
+DEFAULT_SIZE = 1024
+
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """A bounded least-recently-used cache which counts its hits and misses."""
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            if self.maxsize > 0:
+                self._data[key] = value
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+caches: dict[str, LRUCache] = {}
+_size = DEFAULT_SIZE
+
+
+def get_cache(name: str) -> LRUCache:
+    """Returns the named shared cache, creating it if needed."""
+    if name not in caches:
+        caches[name] = LRUCache(_size)
+    return caches[name]
+
+
+_KEYWORDS = object()
+
+
+def memoize(func: Callable[..., T]) -> Callable[..., T]:
+    """Memoize a function of hashable arguments in a cache named after it."""
+    cache = get_cache(f"{func.__module__}.{func.__qualname__}")
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args: Hashable, **kwargs: Hashable) -> T:
+        key: tuple = args
+        if kwargs:
+            # Key keyword calls the same as the equivalent positional call.
+            bound = signature.bind(*args, **kwargs)
+            key = bound.args
+            if bound.kwargs:
+                key = (_KEYWORDS, bound.args, tuple(sorted(bound.kwargs.items())))
+        return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+    wrapper.cache = cache  # type: ignore
+    return wrapper
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Resize every cache. A size of 0 disables caching."""
+    global _size
+    _size = maxsize
+    for cache in caches.values():
+        cache.resize(maxsize)
+
+
+def cache_info() -> dict[str, CacheInfo]:
+    return {name: cache.info() for name, cache in caches.items()}
+
+
+def clear_caches() -> None:
+    for cache in caches.values():
+        cache.clear()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Iterator
+
+from .matrix import Matrix
+from .ray import Ray, RayBundle
+from .transformation import Transform
+from .vector import point
+
+Rect = tuple[int, int, int, int]
+
+
+class Camera:
+    def __init__(
+        self,
+        hsize: int,
+        vsize: int,
+        field_of_view: float,
+        transform: Matrix | Transform | None = None,
+    ) -> None:
+        self.hsize = hsize
+        self.vsize = vsize
+        self.field_of_view = field_of_view
+
+        half_view = math.tan(field_of_view / 2)
+        aspect = hsize / vsize
+        if aspect >= 1:
+            self.half_width = half_view
+            self.half_height = half_view / aspect
+        else:
+            self.half_width = half_view * aspect
+            self.half_height = half_view
+        self.pixel_size = self.half_width * 2 / hsize
+
+        self.transform = Matrix.identity() if transform is None else transform
+
+    @property
+    def transform(self) -> Matrix:
+        return self._transform
+
+    @transform.setter
+    def transform(self, t: Matrix | Transform) -> None:
+        if isinstance(t, Transform):
+            t, self.inverse = t.matrix, t.inverse
+        else:
+            self.inverse = t.inverse()
+        self._transform = t
+        self.origin = self.inverse.transform_point(point(0, 0, 0))
+
+    def ray_for_pixel(self, px: int, py: int) -> Ray:
+        """Returns the ray from the camera through the centre of a pixel."""
+        return self.ray_through(px + 0.5, py + 0.5)
+
+    def ray_through(self, x: float, y: float) -> Ray:
+        """
+        Returns the ray from the camera through a point on the image, measured
+        in pixels from its top left corner.
+        """
+        world_x = self.half_width - x * self.pixel_size
+        world_y = self.half_height - y * self.pixel_size
+        pixel = self.inverse.transform_point(point(world_x, world_y, -1))
+        # Each ray gets its own origin, as Tuples can be changed in place.
+        origin = self.origin
+        return Ray(point(origin.x, origin.y, origin.z), (pixel - origin).normalize())
+
+    def tiles(self, size: int) -> Iterator[Rect]:
+        """Yield (x, y, width, height) tiles covering the image, row by row."""
+        for y in range(0, self.vsize, size):
+            for x in range(0, self.hsize, size):
+                yield x, y, min(size, self.hsize - x), min(size, self.vsize - y)
+
+    def scanlines(self) -> Iterator[Rect]:
+        """Yield a (x, y, width, height) rectangle for each row of the image."""
+        for y in range(self.vsize):
+            yield 0, y, self.hsize, 1
+
+    def rays(self, rect: Rect | None = None) -> Iterator[tuple[int, int, Ray]]:
+        """Lazily yield (px, py, ray) for each pixel in a rectangle, row by row."""
+        x, y, width, height = rect or (0, 0, self.hsize, self.vsize)
+        for py in range(y, y + height):
+            for px in range(x, x + width):
+                yield px, py, self.ray_for_pixel(px, py)
+
+    def bundle(self, rect: Rect | None = None) -> RayBundle:
+        """Returns the rays for each pixel in a rectangle, row by row."""
+        x, y, width, height = rect or (0, 0, self.hsize, self.vsize)
+        m = self.inverse.data
+        ox, oy, oz = self.origin.x, self.origin.y, self.origin.z
+        directions = array("d")
+        for py in range(y, y + height):
+            world_y = self.half_height - (py + 0.5) * self.pixel_size
+            for px in range(x, x + width):
+                world_x = self.half_width - (px + 0.5) * self.pixel_size
+                directions.extend(
+                    (
+                        m[0] * world_x + m[1] * world_y - m[2] + m[3] - ox,
+                        m[4] * world_x + m[5] * world_y - m[6] + m[7] - oy,
+                        m[8] * world_x + m[9] * world_y - m[10] + m[11] - oz,
+                    )
+                )
+        origins = array("d", (ox, oy, oz)) * (width * height)
+        return RayBundle(origins, directions).normalize()
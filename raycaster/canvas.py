@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+import mmap
 import os
-from typing import Generator
+import re
+from array import array
+from typing import BinaryIO, Generator, Iterable
 
+from .backend import get_backend
 from .vector import Colour
 
 
@@ -10,39 +16,222 @@ def chunk(seq: list[str], n: int) -> Generator[list[str], None, None]:
 
 
 class Canvas:
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int, typecode: str = "d", data=None) -> None:
+        """
+        Create a black canvas, stored as doubles ("d") or floats ("f").
+
+        If `data` is given, the canvas uses that writable buffer (for example
+        shared memory) as its pixel storage instead of allocating its own.
+        """
+        if typecode not in ("d", "f"):
+            raise ValueError("Canvas typecode must be 'd' or 'f'")
         self.height = height
         self.width = width
-        self.pixels = [[Colour(0, 0, 0) for _ in range(width)] for _ in range(height)]
+        self.typecode = typecode
+        size = width * height * 3
+        if data is None:
+            self._data = array(typecode, [0.0]) * size
+        else:
+            self._data = memoryview(data).cast("B").cast(typecode)[:size]
+            if len(self._data) != size:
+                raise ValueError("Canvas data buffer is too small")
+
+    @property
+    def buffer(self) -> memoryview:
+        """A writable view of the raw RGB pixel data, row by row."""
+        return memoryview(self._data)
+
+    def _check_rect(self, x: int, y: int, width: int, height: int, op: str) -> None:
+        if not (
+            0 <= x
+            and 0 <= y
+            and 0 <= width
+            and 0 <= height
+            and x + width <= self.width
+            and y + height <= self.height
+        ):
+            raise IndexError(f"Canvas {op} out of range")
 
     def write(self, x: int, y: int, colour: Colour) -> None:
         if not (0 <= x < self.width and 0 <= y < self.height):
             raise IndexError("Canvas write out of range")
-        self.pixels[y][x] = colour
+        i = (y * self.width + x) * 3
+        data = self._data
+        data[i] = colour.x
+        data[i + 1] = colour.y
+        data[i + 2] = colour.z
+
+    def write_rect(
+        self, x: int, y: int, width: int, height: int, colours: Iterable[Colour]
+    ) -> None:
+        """Write a rectangle of pixels, given row by row."""
+        self._check_rect(x, y, width, height, "write")
+        values = array(self.typecode)
+        for colour in colours:
+            values.extend((colour.x, colour.y, colour.z))
+        if len(values) != width * height * 3:
+            raise ValueError("Wrong number of colours for rectangle")
+
+        row_len = width * 3
+        for row in range(height):
+            start = ((y + row) * self.width + x) * 3
+            self._data[start : start + row_len] = values[
+                row * row_len : row * row_len + row_len
+            ]
+
+    def write_row(self, y: int, colours: Iterable[Colour], x: int = 0) -> None:
+        """Write a run of pixels along row `y`, starting at column `x`."""
+        colours = list(colours)
+        self.write_rect(x, y, len(colours), 1, colours)
 
     def get(self, x: int, y: int) -> Colour:
         if not (0 <= x < self.width and 0 <= y < self.height):
             raise IndexError("Canvas read out of range")
-        return self.pixels[y][x]
+        i = (y * self.width + x) * 3
+        data = self._data
+        return Colour(data[i], data[i + 1], data[i + 2])
+
+    def _row_bytes(self, y: int) -> bytes:
+        start = y * self.width * 3
+        return get_backend().quantize(self._data[start : start + self.width * 3])
+
+    def _ppm_p3_lines(self) -> Generator[str, None, None]:
+        yield ppm_header(self.width, self.height, "p3").decode("ascii")
+        for y in range(self.height):
+            yield from _p3_lines(self._row_bytes(y))
 
     def as_ppm_string(self) -> str:
-        header = f"P3\n{self.width} {self.height}\n255\n"
-        body = "\n".join(
-            "\n".join(
-                " ".join(line)
-                for line in chunk(
-                    [
-                        f"{pixel.r*255:.0f} {pixel.g*255:.0f} {pixel.b*255:.0f}"
-                        for pixel in row
-                    ],
-                    5,
-                )
-            )
-            for row in self.pixels
-        )
-        return header + body + "\n"
-
-    def save_ppm(self, path: os.PathLike) -> None:
-        data = self.as_ppm_string()
-        with open(path, "w") as f:
-            f.write(data)
+        return "".join(self._ppm_p3_lines())
+
+    def write_ppm(self, f: BinaryIO, format: str = "p3") -> None:
+        """Write the canvas to a binary file object, one row at a time."""
+        f.write(ppm_header(self.width, self.height, format))
+        for y in range(self.height):
+            f.write(ppm_row(self._row_bytes(y), format))
+
+    def save_ppm(self, path: os.PathLike, format: str = "p3") -> None:
+        with open(path, "wb") as f:
+            self.write_ppm(f, format)
+
+
+def ppm_header(width: int, height: int, format: str = "p3") -> bytes:
+    if format not in ("p3", "p6"):
+        raise ValueError("PPM format must be 'p3' or 'p6'")
+    return f"{format.upper()}\n{width} {height}\n255\n".encode("ascii")
+
+
+def _p3_lines(pixels: bytes) -> Generator[str, None, None]:
+    # Five pixels per line keeps lines under the PPM limit of 70 chars.
+    for line in chunk([str(v) for v in pixels], 15):
+        yield " ".join(line) + "\n"
+
+
+def ppm_row(pixels: bytes, format: str = "p3") -> bytes:
+    """Encode a row of 8-bit RGB values, as returned by Backend.quantize."""
+    if format == "p6":
+        return pixels
+    return "".join(_p3_lines(pixels)).encode("ascii")
+
+
+_P6_HEADER = re.compile(rb"P6\n(\d+) (\d+)\n255\n")
+
+
+class MappedCanvas(Canvas):
+    """
+    A canvas stored in a memory-mapped file, for images too large for memory.
+
+    The file is a P6 PPM: its header, then 8-bit RGB pixels row by row. Pixels
+    are written straight into the mapping and the OS pages them in and out, so
+    the file is the finished image once flushed and memory use doesn't grow
+    with the image size. Colours are quantised as they are written, so get()
+    returns them rounded to multiples of 1/255.
+    """
+
+    def __init__(self, path: str | os.PathLike, width: int, height: int) -> None:
+        """Create a black canvas, replacing any existing file at `path`."""
+        header = ppm_header(width, height, "p6")
+        with open(path, "w+b") as f:
+            f.write(header)
+            # Extending the file leaves a sparse, zero-filled (black) image.
+            f.truncate(len(header) + width * height * 3)
+        self._map(path, width, height, len(header))
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> MappedCanvas:
+        """Map an existing file written by MappedCanvas, e.g. to resume a render."""
+        with open(path, "rb") as f:
+            match = _P6_HEADER.match(f.read(64))
+        if match is None:
+            raise ValueError(f"{path} is not a MappedCanvas file")
+        canvas = cls.__new__(cls)
+        canvas._map(path, int(match[1]), int(match[2]), match.end())
+        return canvas
+
+    def _map(
+        self, path: str | os.PathLike, width: int, height: int, offset: int
+    ) -> None:
+        self.path = path
+        self.width = width
+        self.height = height
+        self.typecode = "B"
+        with open(path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        size = width * height * 3
+        if len(self._mmap) < offset + size:
+            self.close()
+            raise ValueError(f"{path} is too small for a {width}x{height} image")
+        self._data = memoryview(self._mmap)[offset : offset + size]
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """Flush and unmap the file. Views from `buffer` must be released first."""
+        if self._mmap.closed:
+            return
+        if hasattr(self, "_data"):
+            self._data.release()
+        self._mmap.flush()
+        self._mmap.close()
+
+    def __enter__(self) -> MappedCanvas:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, x: int, y: int, colour: Colour) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("Canvas write out of range")
+        i = (y * self.width + x) * 3
+        self._data[i : i + 3] = get_backend().quantize((colour.x, colour.y, colour.z))
+
+    def write_rect(
+        self, x: int, y: int, width: int, height: int, colours: Iterable[Colour]
+    ) -> None:
+        """Write a rectangle of pixels, given row by row."""
+        self._check_rect(x, y, width, height, "write")
+        values = array("d")
+        for colour in colours:
+            values.extend((colour.x, colour.y, colour.z))
+        if len(values) != width * height * 3:
+            raise ValueError("Wrong number of colours for rectangle")
+
+        pixels = get_backend().quantize(values)
+        row_len = width * 3
+        for row in range(height):
+            start = ((y + row) * self.width + x) * 3
+            self._data[start : start + row_len] = pixels[
+                row * row_len : row * row_len + row_len
+            ]
+
+    def get(self, x: int, y: int) -> Colour:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("Canvas read out of range")
+        i = (y * self.width + x) * 3
+        data = self._data
+        return Colour(data[i] / 255, data[i + 1] / 255, data[i + 2] / 255)
+
+    def _row_bytes(self, y: int) -> bytes:
+        start = y * self.width * 3
+        return self._data[start : start + self.width * 3].tobytes()
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterable
 
-from .vector import Tuple
+from .backend import get_backend
+from .cache import get_cache
+from .vector import Tuple, _make
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    Batch = np.ndarray | array | memoryview | Iterable[float] | Iterable[Tuple]
+    BatchResult = np.ndarray | array | list[Tuple]
 
 
 class Matrix:
@@ -56,33 +66,175 @@ class Matrix:
         return ValueError("Cannot understand that setitem format")
 
     def __mul__(self, other: Tuple | Matrix) -> Tuple | Matrix:
-        if isinstance(other, self.__class__):
+        if isinstance(other, Matrix):
             assert self.size == other.size == 4
-            new_data = []
-            for row in range(4):
-                for col in range(4):
-                    new_data.append(sum(self[row, i] * other[i, col] for i in range(4)))
-            return self.__class__(new_data)
+            # fmt: off
+            (a00, a01, a02, a03,
+             a10, a11, a12, a13,
+             a20, a21, a22, a23,
+             a30, a31, a32, a33) = self.data
+            (b00, b01, b02, b03,
+             b10, b11, b12, b13,
+             b20, b21, b22, b23,
+             b30, b31, b32, b33) = other.data
+            return Matrix([
+                a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30,
+                a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31,
+                a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32,
+                a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33,
+                a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30,
+                a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31,
+                a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32,
+                a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33,
+                a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30,
+                a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31,
+                a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32,
+                a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33,
+                a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30,
+                a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31,
+                a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32,
+                a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33,
+            ])
+            # fmt: on
         elif isinstance(other, Tuple):
-            return Tuple(
-                sum(a * b for a, b in zip(self[0], other)),
-                sum(a * b for a, b in zip(self[1], other)),
-                sum(a * b for a, b in zip(self[2], other)),
-                sum(a * b for a, b in zip(self[3], other)),
+            m = self.data
+            x, y, z, w = other.x, other.y, other.z, other.w
+            return _make(
+                Tuple,
+                m[0] * x + m[1] * y + m[2] * z + m[3] * w,
+                m[4] * x + m[5] * y + m[6] * z + m[7] * w,
+                m[8] * x + m[9] * y + m[10] * z + m[11] * w,
+                m[12] * x + m[13] * y + m[14] * z + m[15] * w,
             )
         raise NotImplementedError
 
+    def transform_point(self, p: Tuple) -> Tuple:
+        """Multiply a point by the matrix, treating its w as exactly 1."""
+        m = self.data
+        x, y, z = p.x, p.y, p.z
+        return _make(
+            Tuple,
+            m[0] * x + m[1] * y + m[2] * z + m[3],
+            m[4] * x + m[5] * y + m[6] * z + m[7],
+            m[8] * x + m[9] * y + m[10] * z + m[11],
+            m[12] * x + m[13] * y + m[14] * z + m[15],
+        )
+
+    def transform_vector(self, v: Tuple) -> Tuple:
+        """Multiply a vector by the matrix, treating its w as exactly 0."""
+        m = self.data
+        x, y, z = v.x, v.y, v.z
+        return _make(
+            Tuple,
+            m[0] * x + m[1] * y + m[2] * z,
+            m[4] * x + m[5] * y + m[6] * z,
+            m[8] * x + m[9] * y + m[10] * z,
+            m[12] * x + m[13] * y + m[14] * z,
+        )
+
+    def apply_points(self, seq: Batch) -> BatchResult:
+        """
+        Transform many points at once.
+
+        Takes a NumPy array of shape (N, 3) or (N, 4), a flat sequence of xyz
+        floats (which gives an array("d")) or an iterable of Tuples (which gives
+        a list of Tuples), and returns the results in the same form. An empty
+        sequence is treated as xyz floats and gives an empty array("d").
+
+        The w column of an (N, 4) array is ignored: every row is transformed as
+        a point here, and as a vector by apply_vectors.
+        """
+        return self._apply(seq, 1)
+
+    def apply_vectors(self, seq: Batch) -> BatchResult:
+        """Transform many vectors at once. See apply_points for accepted forms."""
+        return self._apply(seq, 0)
+
+    def _apply(self, seq: Batch, w: int) -> BatchResult:
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(seq, np.ndarray):
+            m = np.array(self.data).reshape(4, 4)
+            if seq.ndim == 2 and seq.shape[1] == 4:
+                return seq[:, :3] @ m[:, :3].T + w * m[:, 3]
+            if seq.ndim == 2 and seq.shape[1] == 3:
+                return seq @ m[:3, :3].T + w * m[:3, 3]
+            raise ValueError("Expected an array of shape (N, 3) or (N, 4)")
+
+        if not isinstance(seq, (array, memoryview)):
+            seq = list(seq)
+            if seq and isinstance(seq[0], Tuple):
+                apply = self.transform_point if w else self.transform_vector
+                return [apply(t) for t in seq]
+
+        if len(seq) % 3:
+            raise ValueError("Expected a flat sequence of xyz values")
+        return get_backend().transform(self.data, seq, w)
+
     def transpose(self) -> Matrix:
-        return self.__class__(el for row in zip(*self[:]) for el in row)
+        return Matrix(el for row in zip(*self[:]) for el in row)
 
     def determinant(self) -> int:
         if self.size == 2:
-            return self[0, 0] * self[1, 1] - self[0, 1] * self[1, 0]
+            a, b, c, d = self.data
+            return a * d - b * c
+        if self.size == 3:
+            a, b, c, d, e, f, g, h, i = self.data
+            return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+        if self.size == 4:
+            return self._determinant_4x4()
+        return self._determinant_lu()
+
+    def _subdeterminants_4x4(self) -> tuple[float, ...]:
+        # The 2x2 determinants of the top two and bottom two rows, from which
+        # both the 4x4 determinant and its adjugate can be built.
+        # fmt: off
+        (a00, a01, a02, a03,
+         a10, a11, a12, a13,
+         a20, a21, a22, a23,
+         a30, a31, a32, a33) = self.data
+        # fmt: on
+        return (
+            a00 * a11 - a10 * a01,
+            a00 * a12 - a10 * a02,
+            a00 * a13 - a10 * a03,
+            a01 * a12 - a11 * a02,
+            a01 * a13 - a11 * a03,
+            a02 * a13 - a12 * a03,
+            a20 * a31 - a30 * a21,
+            a20 * a32 - a30 * a22,
+            a20 * a33 - a30 * a23,
+            a21 * a32 - a31 * a22,
+            a21 * a33 - a31 * a23,
+            a22 * a33 - a32 * a23,
+        )
+
+    def _determinant_4x4(self) -> float:
+        s0, s1, s2, s3, s4, s5, c0, c1, c2, c3, c4, c5 = self._subdeterminants_4x4()
+        return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
 
-        return sum(self.cofactor(0, pos) * el for pos, el in enumerate(self[0]))
+    def _determinant_lu(self) -> float:
+        n = self.size
+        rows = [list(self.data[i * n : i * n + n]) for i in range(n)]
+        det = 1.0
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+            if rows[pivot][col] == 0:
+                return 0.0
+            if pivot != col:
+                rows[col], rows[pivot] = rows[pivot], rows[col]
+                det = -det
+            pivot_row = rows[col]
+            pivot_val = pivot_row[col]
+            det *= pivot_val
+            for row in rows[col + 1 :]:
+                factor = row[col] / pivot_val
+                if factor:
+                    for k in range(col + 1, n):
+                        row[k] -= factor * pivot_row[k]
+        return det
 
     def submatrix(self, row: int, column: int) -> Matrix:
-        return self.__class__(
+        return Matrix(
             [
                 el
                 for pos, el in enumerate(self.data)
@@ -100,13 +252,71 @@ class Matrix:
         return self.determinant() != 0
 
     def inverse(self) -> Matrix:
+        if self.size == 4:
+            return self._inverse_4x4()
+        if self.size > 4 or self.size == 1:
+            return self._inverse_gauss_jordan()
+
         new_data = []
         det = self.determinant()
         for row in range(self.size):
             for col in range(self.size):
                 c = self.cofactor(row, col)
                 new_data.append(c / det)
-        return self.__class__(new_data).transpose()
+        return Matrix(new_data).transpose()
+
+    def _inverse_4x4(self) -> Matrix:
+        # fmt: off
+        (a00, a01, a02, a03,
+         a10, a11, a12, a13,
+         a20, a21, a22, a23,
+         a30, a31, a32, a33) = self.data
+        # fmt: on
+        s0, s1, s2, s3, s4, s5, c0, c1, c2, c3, c4, c5 = self._subdeterminants_4x4()
+        det = s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+        adjugate = (
+            a11 * c5 - a12 * c4 + a13 * c3,
+            -a01 * c5 + a02 * c4 - a03 * c3,
+            a31 * s5 - a32 * s4 + a33 * s3,
+            -a21 * s5 + a22 * s4 - a23 * s3,
+            -a10 * c5 + a12 * c2 - a13 * c1,
+            a00 * c5 - a02 * c2 + a03 * c1,
+            -a30 * s5 + a32 * s2 - a33 * s1,
+            a20 * s5 - a22 * s2 + a23 * s1,
+            a10 * c4 - a11 * c2 + a13 * c0,
+            -a00 * c4 + a01 * c2 - a03 * c0,
+            a30 * s4 - a31 * s2 + a33 * s0,
+            -a20 * s4 + a21 * s2 - a23 * s0,
+            -a10 * c3 + a11 * c1 - a12 * c0,
+            a00 * c3 - a01 * c1 + a02 * c0,
+            -a30 * s3 + a31 * s1 - a32 * s0,
+            a20 * s3 - a21 * s1 + a22 * s0,
+        )
+        # Divide rather than multiplying by 1/det so integer matrices give the
+        # same results as the cofactor definition.
+        return Matrix([el / det for el in adjugate])
+
+    def _inverse_gauss_jordan(self) -> Matrix:
+        n = self.size
+        rows = [
+            [*self.data[i * n : i * n + n], *(float(i == j) for j in range(n))]
+            for i in range(n)
+        ]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+            if rows[pivot][col] == 0:
+                raise ZeroDivisionError("Matrix is not invertible")
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            pivot_row = rows[col]
+            pivot_val = pivot_row[col]
+            for k in range(2 * n):
+                pivot_row[k] /= pivot_val
+            for i, row in enumerate(rows):
+                factor = row[col]
+                if i != col and factor:
+                    for k in range(2 * n):
+                        row[k] -= factor * pivot_row[k]
+        return Matrix(el for row in rows for el in row[n:])
 
     def __repr__(self) -> str:
         res = []
@@ -117,7 +327,7 @@ class Matrix:
         return "[" + "".join(res).strip() + "]"
 
     def __eq__(self, other) -> bool:
-        if isinstance(other, self.__class__):
+        if isinstance(other, Matrix):
             return self.is_close(other, abs_tol=1e-10)
         return NotImplemented
 
@@ -138,3 +348,178 @@ class Matrix:
             0, 0, 0, 1,
         ])
         # fmt: on
+
+    def freeze(self) -> FrozenMatrix:
+        return FrozenMatrix(self.data)
+
+
+class FrozenMatrix(Matrix):
+    """
+    An immutable, hashable Matrix.
+
+    Hashing uses the exact values, so matrices which are only equal within
+    tolerance may hash differently. Products and other derived matrices are
+    plain Matrix objects, except inverses and transposes, which are memoized
+    and so are frozen too, as every caller shares them.
+    """
+
+    def __init__(self, data: Iterable[float]):
+        self.data = tuple(float(el) for el in data)
+        self.size = int(len(self.data) ** 0.5)
+        self._hash = hash(self.data)
+
+    def __setitem__(self, index, val):
+        raise TypeError("FrozenMatrix is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def freeze(self) -> FrozenMatrix:
+        return self
+
+    def inverse(self) -> FrozenMatrix:
+        return _inverse_cache.get_or_compute(
+            self, lambda: Matrix.inverse(self).freeze()
+        )
+
+    def transpose(self) -> FrozenMatrix:
+        return _transpose_cache.get_or_compute(
+            self, lambda: Matrix.transpose(self).freeze()
+        )
+
+
+_inverse_cache = get_cache("FrozenMatrix.inverse")
+_transpose_cache = get_cache("FrozenMatrix.transpose")
+
+
+class AffineMatrix:
+    """
+    A 4x4 matrix whose bottom row is known to be (0, 0, 0, 1).
+
+    Only the top three rows are stored, as 12 doubles.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Iterable[float]) -> None:
+        self.data = array("d", data)
+        if len(self.data) != 12:
+            raise ValueError("AffineMatrix needs exactly 12 values")
+
+    @classmethod
+    def from_matrix(cls, m: Matrix) -> AffineMatrix:
+        if m.size != 4 or list(m.data[12:]) != [0, 0, 0, 1]:
+            raise ValueError("Matrix is not affine")
+        return cls(m.data[:12])
+
+    def to_matrix(self) -> Matrix:
+        return Matrix([*self.data, 0, 0, 0, 1])
+
+    @classmethod
+    def identity(cls) -> AffineMatrix:
+        # fmt: off
+        return cls([
+            1, 0, 0, 0,
+            0, 1, 0, 0,
+            0, 0, 1, 0,
+        ])
+        # fmt: on
+
+    def __mul__(self, other: AffineMatrix | Tuple) -> AffineMatrix | Tuple:
+        if isinstance(other, AffineMatrix):
+            # fmt: off
+            (a00, a01, a02, a03,
+             a10, a11, a12, a13,
+             a20, a21, a22, a23) = self.data
+            (b00, b01, b02, b03,
+             b10, b11, b12, b13,
+             b20, b21, b22, b23) = other.data
+            return AffineMatrix((
+                a00 * b00 + a01 * b10 + a02 * b20,
+                a00 * b01 + a01 * b11 + a02 * b21,
+                a00 * b02 + a01 * b12 + a02 * b22,
+                a00 * b03 + a01 * b13 + a02 * b23 + a03,
+                a10 * b00 + a11 * b10 + a12 * b20,
+                a10 * b01 + a11 * b11 + a12 * b21,
+                a10 * b02 + a11 * b12 + a12 * b22,
+                a10 * b03 + a11 * b13 + a12 * b23 + a13,
+                a20 * b00 + a21 * b10 + a22 * b20,
+                a20 * b01 + a21 * b11 + a22 * b21,
+                a20 * b02 + a21 * b12 + a22 * b22,
+                a20 * b03 + a21 * b13 + a22 * b23 + a23,
+            ))
+            # fmt: on
+        elif isinstance(other, Tuple):
+            m = self.data
+            x, y, z, w = other.x, other.y, other.z, other.w
+            return _make(
+                Tuple,
+                m[0] * x + m[1] * y + m[2] * z + m[3] * w,
+                m[4] * x + m[5] * y + m[6] * z + m[7] * w,
+                m[8] * x + m[9] * y + m[10] * z + m[11] * w,
+                w,
+            )
+        return NotImplemented
+
+    def transform_point(self, p: Tuple) -> Tuple:
+        m = self.data
+        x, y, z = p.x, p.y, p.z
+        return _make(
+            Tuple,
+            m[0] * x + m[1] * y + m[2] * z + m[3],
+            m[4] * x + m[5] * y + m[6] * z + m[7],
+            m[8] * x + m[9] * y + m[10] * z + m[11],
+            1.0,
+        )
+
+    def transform_vector(self, v: Tuple) -> Tuple:
+        m = self.data
+        x, y, z = v.x, v.y, v.z
+        return _make(
+            Tuple,
+            m[0] * x + m[1] * y + m[2] * z,
+            m[4] * x + m[5] * y + m[6] * z,
+            m[8] * x + m[9] * y + m[10] * z,
+            0.0,
+        )
+
+    def determinant(self) -> float:
+        a, b, c, _, d, e, f, _, g, h, i, _ = self.data
+        return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+    def inverse(self) -> AffineMatrix:
+        """Invert the 3x3 linear part, then undo the translation with it."""
+        a, b, c, tx, d, e, f, ty, g, h, i, tz = self.data
+        c0 = e * i - f * h
+        c1 = f * g - d * i
+        c2 = d * h - e * g
+        det = a * c0 + b * c1 + c * c2
+        r00 = c0 / det
+        r01 = (c * h - b * i) / det
+        r02 = (b * f - c * e) / det
+        r10 = c1 / det
+        r11 = (a * i - c * g) / det
+        r12 = (c * d - a * f) / det
+        r20 = c2 / det
+        r21 = (b * g - a * h) / det
+        r22 = (a * e - b * d) / det
+        # fmt: off
+        return AffineMatrix((
+            r00, r01, r02, -(r00 * tx + r01 * ty + r02 * tz),
+            r10, r11, r12, -(r10 * tx + r11 * ty + r12 * tz),
+            r20, r21, r22, -(r20 * tx + r21 * ty + r22 * tz),
+        ))
+        # fmt: on
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, self.__class__):
+            return self.is_close(other, abs_tol=1e-10)
+        return NotImplemented
+
+    def is_close(self, other: AffineMatrix, abs_tol: float = 1e-5) -> bool:
+        return all(
+            math.isclose(a, b, abs_tol=abs_tol) for a, b in zip(self.data, other.data)
+        )
+
+    def __repr__(self) -> str:
+        return f"AffineMatrix({self.to_matrix()!r})"
@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+import math
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .backend import NumpyBackend, get_backend
+from .bounds import Bounds
 from .matrix import Matrix
-from .vector import Tuple, point
+from .transformation import Transform
+from .vector import Tuple, madd, point, vector
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .world import World
 
 
 class Ray:
@@ -10,12 +22,13 @@ class Ray:
         self.direction = direction
 
     def position(self, t: float) -> Tuple:
-        return self.origin + self.direction * t
+        return madd(self.origin, self.direction, t)
 
     def intersect(self, s: Sphere):
-        sphere_to_ray = self.origin - point(0, 0, 0)
-        a = self.direction.dot(self.direction)
-        b = 2 * self.direction.dot(sphere_to_ray)
+        ray = self.transform(s.inverse)
+        sphere_to_ray = ray.origin - point(0, 0, 0)
+        a = ray.direction.dot(ray.direction)
+        b = 2 * ray.direction.dot(sphere_to_ray)
         c = sphere_to_ray.dot(sphere_to_ray) - 1
 
         discrim = b**2 - 4 * a * c
@@ -29,10 +42,85 @@ class Ray:
             Intersection(t2, s),
         )
 
+    def nearest_hit(
+        self, target: Sphere | World, t_min: float = 0, t_max: float = math.inf
+    ) -> tuple[float, Sphere] | None:
+        """
+        Returns the nearest t in (t_min, t_max) where the ray hits a shape or
+        world, with the shape it hit, without building any Intersections.
+        """
+        return target.nearest_hit(self, t_min, t_max)
+
     def transform(self, t: Matrix) -> Ray:
         return Ray(
-            t * self.origin,
-            t * self.direction,
+            t.transform_point(self.origin),
+            t.transform_vector(self.direction),
+        )
+
+
+class RayBundle:
+    """
+    A packet of rays, stored as flat arrays of origin and direction components.
+
+    Origins are points and directions are vectors, so only x, y and z are
+    stored for each ray.
+    """
+
+    def __init__(self, origins: Iterable[float], directions: Iterable[float]) -> None:
+        self.origins = array("d", origins)
+        self.directions = array("d", directions)
+        if len(self.origins) != len(self.directions) or len(self.origins) % 3:
+            raise ValueError("Origins and directions must be the same number of xyz")
+
+    @classmethod
+    def from_rays(cls, rays: Iterable[Ray]) -> RayBundle:
+        origins = array("d")
+        directions = array("d")
+        for ray in rays:
+            origins.extend((ray.origin.x, ray.origin.y, ray.origin.z))
+            directions.extend((ray.direction.x, ray.direction.y, ray.direction.z))
+        return cls(origins, directions)
+
+    def __len__(self) -> int:
+        return len(self.origins) // 3
+
+    def __getitem__(self, n: int) -> Ray:
+        if not -len(self) <= n < len(self):
+            raise IndexError("RayBundle index out of range")
+        i = (n % len(self)) * 3
+        o, d = self.origins, self.directions
+        return Ray(point(o[i], o[i + 1], o[i + 2]), vector(d[i], d[i + 1], d[i + 2]))
+
+    def __iter__(self) -> Iterator[Ray]:
+        return (self[n] for n in range(len(self)))
+
+    def position(self, ts: Iterable[float]) -> array:
+        """Return the xyz of each ray's position at its own t, as one flat array."""
+        o, d = self.origins, self.directions
+        out = array("d", o)
+        for n, t in enumerate(ts):
+            i = n * 3
+            out[i] += d[i] * t
+            out[i + 1] += d[i + 1] * t
+            out[i + 2] += d[i + 2] * t
+        return out
+
+    def transform(self, t: Matrix) -> RayBundle:
+        return RayBundle(t.apply_points(self.origins), t.apply_vectors(self.directions))
+
+    def normalize(self) -> RayBundle:
+        """Returns a bundle with the same origins and unit length directions."""
+        return RayBundle(self.origins, get_backend().normalize3(self.directions))
+
+    def intersect(self, s: Sphere) -> tuple[array, array, array]:
+        """
+        Intersect every ray with a sphere.
+
+        Returns arrays of the near and far t values, which are NaN for misses,
+        and an array of 1 for each ray that hit and 0 for each that missed.
+        """
+        return get_backend().intersect_spheres(
+            s.inverse.data, self.origins, self.directions
         )
 
 
@@ -40,13 +128,76 @@ class Sphere:
     def __init__(self) -> None:
         self.transform = Matrix.identity()
 
-    def set_transform(self, t: Matrix) -> None:
+    @property
+    def transform(self) -> Matrix:
+        return self._transform
+
+    @transform.setter
+    def transform(self, t: Matrix | Transform) -> None:
+        # The transform is read far more often than it is set, so derive the
+        # matrices needed for intersection and shading once, up front. That
+        # means a singular transform, which would squash the sphere flat, is
+        # rejected here with a ZeroDivisionError, and the sphere is unchanged.
+        if isinstance(t, Transform):
+            t, self.inverse = t.matrix, t.inverse
+        else:
+            try:
+                inverse = t.inverse()
+            except ZeroDivisionError:
+                raise ZeroDivisionError(
+                    "Sphere transform is singular and can't be inverted"
+                ) from None
+            self.inverse = inverse
+        self._transform = t
+        self.determinant = t.determinant()
+        self.inverse_transpose = self.inverse.transpose()
+        self.bounds = Bounds(-1, -1, -1, 1, 1, 1).transform(t)
+
+    def set_transform(self, t: Matrix | Transform) -> None:
         self.transform = t
 
+    def intersect(self, ray: Ray) -> Intersections:
+        return ray.intersect(self)
+
+    def nearest_hit(
+        self, ray: Ray, t_min: float = 0, t_max: float = math.inf
+    ) -> tuple[float, Sphere] | None:
+        # Ray.intersect, unrolled to move the ray into object space and solve
+        # the quadratic without allocating anything on a miss.
+        m = self.inverse.data
+        ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+        dx, dy, dz = ray.direction.x, ray.direction.y, ray.direction.z
+        lox = m[0] * ox + m[1] * oy + m[2] * oz + m[3]
+        loy = m[4] * ox + m[5] * oy + m[6] * oz + m[7]
+        loz = m[8] * ox + m[9] * oy + m[10] * oz + m[11]
+        ldx = m[0] * dx + m[1] * dy + m[2] * dz
+        ldy = m[4] * dx + m[5] * dy + m[6] * dz
+        ldz = m[8] * dx + m[9] * dy + m[10] * dz
+
+        a = ldx * ldx + ldy * ldy + ldz * ldz
+        b = 2 * (ldx * lox + ldy * loy + ldz * loz)
+        c = lox * lox + loy * loy + loz * loz - 1
+        discrim = b * b - 4 * a * c
+        if discrim < 0:
+            return None
+
+        root = discrim**0.5
+        t = (-b - root) / (2 * a)
+        if t_min < t < t_max:
+            return t, self
+        t = (-b + root) / (2 * a)
+        if t_min < t < t_max:
+            return t, self
+        return None
+
+    def occluded(self, ray: Ray, max_distance: float = math.inf) -> bool:
+        """Returns True if the ray hits the sphere between 0 and max_distance."""
+        return self.nearest_hit(ray, 0, max_distance) is not None
+
     def normal_at(self, world_point: Tuple) -> Tuple:
-        object_point = self.transform.inverse() * world_point
+        object_point = self.inverse * world_point
         object_normal = object_point - point(0, 0, 0)
-        world_normal = self.transform.inverse().transpose() * object_normal
+        world_normal = self.inverse_transpose * object_normal
         world_normal.w = 0
         return world_normal.normalize()
 
@@ -70,3 +221,21 @@ class Intersections:
     @property
     def count(self) -> int:
         return len(self.intersections)
+
+
+def intersect_many(
+    origins: np.ndarray, directions: np.ndarray, s: Sphere
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Intersect many rays with a sphere at once.
+
+    `origins` and `directions` are (N, 4) arrays of points and vectors. Returns
+    the near and far t values, which are NaN for misses, and a boolean mask of
+    the rays which hit. Requires NumPy, and always computes with it whichever
+    backend is selected.
+    """
+    import numpy as np
+
+    return NumpyBackend()._intersect_spheres(
+        s.inverse.data, np.asarray(origins)[:, :3], np.asarray(directions)[:, :3]
+    )
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import BinaryIO, Callable, Protocol
+
+from . import stats
+from .backend import get_backend
+from .camera import Camera, Rect
+from .canvas import Canvas, ppm_header, ppm_row
+from .ray import Intersections, Ray, Sphere
+from .vector import Colour
+
+BACKGROUND = Colour(0, 0, 0)
+
+
+class Scene(Protocol):
+    def intersect(self, ray: Ray) -> Intersections:
+        ...
+
+    def nearest_hit(
+        self, ray: Ray, t_min: float = 0, t_max: float = math.inf
+    ) -> tuple[float, Sphere] | None:
+        ...
+
+
+def colour_at(scene: Scene, ray: Ray) -> Colour:
+    """Shade the nearest hit along a ray by its surface normal."""
+    return sample_at(scene, ray)[0]
+
+
+Sample = tuple[Colour, Sphere | None]
+
+
+def sample_at(scene: Scene, ray: Ray) -> Sample:
+    """Like colour_at, but also returns the shape hit, or None for a miss."""
+    hit = ray.nearest_hit(scene)
+    if hit is None:
+        # A copy, so in-place operations on the result can't change BACKGROUND.
+        return Colour(BACKGROUND.x, BACKGROUND.y, BACKGROUND.z), None
+    t, obj = hit
+    normal = obj.normal_at(ray.position(t))
+    return Colour((normal.x + 1) / 2, (normal.y + 1) / 2, (normal.z + 1) / 2), obj
+
+
+def render_tile(scene: Scene, camera: Camera, canvas: Canvas, rect: Rect) -> None:
+    collecting = stats.active()
+    if collecting is not None:
+        _render_tile_with_stats(scene, camera, canvas, rect, collecting)
+        return
+    x, y, width, height = rect
+    canvas.write_rect(
+        x, y, width, height, (colour_at(scene, ray) for _, _, ray in camera.rays(rect))
+    )
+
+
+def _render_tile_with_stats(
+    scene: Scene, camera: Camera, canvas: Canvas, rect: Rect, collecting: stats.Stats
+) -> None:
+    start = time.perf_counter()
+    first_test = collecting.intersection_tests
+    colours = []
+    for px, py, ray in camera.rays(rect):
+        tests = collecting.intersection_tests
+        colours.append(colour_at(scene, ray))
+        collecting.pixel_cost[px, py] = collecting.intersection_tests - tests
+    canvas.write_rect(*rect, colours)
+    collecting.tiles.append(
+        stats.TileStats(
+            rect,
+            time.perf_counter() - start,
+            collecting.intersection_tests - first_test,
+        )
+    )
+
+
+def render(
+    scene: Scene, camera: Camera, tile: int = 64, canvas: Canvas | None = None
+) -> Canvas:
+    """Render a tile at a time, into `canvas` if given (e.g. a MappedCanvas)."""
+    if canvas is None:
+        canvas = Canvas(camera.hsize, camera.vsize)
+    elif (canvas.width, canvas.height) != (camera.hsize, camera.vsize):
+        raise ValueError("Canvas size doesn't match the camera")
+    for rect in camera.tiles(tile):
+        render_tile(scene, camera, canvas, rect)
+    return canvas
+
+
+def render_to_stream(
+    scene: Scene, camera: Camera, fileobj: BinaryIO, format: str = "p6"
+) -> None:
+    """
+    Render scanline by scanline, writing a PPM image to a binary file object.
+
+    Each row is written and flushed as soon as it's rendered, so only one row
+    is held in memory and a reader on the other end of a pipe can start before
+    the render finishes.
+    """
+    fileobj.write(ppm_header(camera.hsize, camera.vsize, format))
+    quantize = get_backend().quantize
+    for rect in camera.scanlines():
+        values = array("d")
+        for _, _, ray in camera.rays(rect):
+            colour = colour_at(scene, ray)
+            values.extend((colour.x, colour.y, colour.z))
+        fileobj.write(ppm_row(quantize(values), format))
+        fileobj.flush()
+
+
+def _similar(a: Sample, b: Sample, threshold: float) -> bool:
+    (ca, obj_a), (cb, obj_b) = a, b
+    return obj_a is obj_b and (
+        abs(ca.x - cb.x) <= threshold
+        and abs(ca.y - cb.y) <= threshold
+        and abs(ca.z - cb.z) <= threshold
+    )
+
+
+def _supersample(
+    scene: Scene,
+    camera: Camera,
+    x: float,
+    y: float,
+    size: float,
+    depth: int,
+    threshold: float,
+) -> tuple[Colour, int]:
+    # Trace the centres of the four quarters of the square at (x, y), and
+    # subdivide again while they disagree.
+    half = size / 2
+    corners = [(x, y), (x + half, y), (x, y + half), (x + half, y + half)]
+    samples = [
+        sample_at(scene, camera.ray_through(cx + half / 2, cy + half / 2))
+        for cx, cy in corners
+    ]
+    rays = 4
+    if depth > 1 and not all(_similar(samples[0], s, threshold) for s in samples):
+        colours = []
+        for cx, cy in corners:
+            colour, n = _supersample(scene, camera, cx, cy, half, depth - 1, threshold)
+            colours.append(colour)
+            rays += n
+    else:
+        colours = [colour for colour, _ in samples]
+    total = colours[0] + colours[1] + colours[2] + colours[3]
+    return Colour(total.x / 4, total.y / 4, total.z / 4), rays
+
+
+def render_adaptive(
+    scene: Scene, camera: Camera, threshold: float = 0.1, max_depth: int = 2
+) -> tuple[Canvas, int]:
+    """
+    Render with anti-aliasing only where it's needed.
+
+    One ray is traced per pixel. Pixels which hit a different shape to one of
+    their neighbours, or whose colour differs from it by more than `threshold`
+    in any channel, are then supersampled. Each level of subdivision traces
+    four rays per square, and squares that still disagree are split again, up
+    to `max_depth` levels. Returns the canvas and the number of extra rays.
+    """
+    width, height = camera.hsize, camera.vsize
+    samples = [sample_at(scene, ray) for _, _, ray in camera.rays()]
+
+    edges = bytearray(width * height)
+    for i, sample in enumerate(samples):
+        x = i % width
+        if x + 1 < width and not _similar(sample, samples[i + 1], threshold):
+            edges[i] = edges[i + 1] = 1
+        if i + width < len(samples) and not _similar(
+            sample, samples[i + width], threshold
+        ):
+            edges[i] = edges[i + width] = 1
+
+    canvas = Canvas(width, height)
+    canvas.write_rect(0, 0, width, height, (colour for colour, _ in samples))
+    extra_rays = 0
+    if max_depth < 1:
+        return canvas, extra_rays
+    for i in range(len(edges)):
+        if edges[i]:
+            x, y = i % width, i // width
+            colour, rays = _supersample(scene, camera, x, y, 1, max_depth, threshold)
+            canvas.write(x, y, colour)
+            extra_rays += rays
+    return canvas, extra_rays
+
+
+class Cancellation(Protocol):
+    """Anything with an is_set() method, such as a threading.Event."""
+
+    def is_set(self) -> bool:
+        ...
+
+
+def render_progressive(
+    scene: Scene,
+    camera: Camera,
+    block: int = 16,
+    callback: Callable[[Canvas, int], None] | None = None,
+    deadline: float | None = None,
+    cancel: Cancellation | None = None,
+) -> Canvas:
+    """
+    Render coarse to fine, so a rough image is available quickly.
+
+    The first pass traces one ray per `block` x `block` square and fills the
+    whole square with its colour. Each later pass halves the square size and
+    only traces the pixels not already traced, until every pixel has its own
+    ray and the image matches render(). `callback(canvas, size)` is called after
+    each pass.
+
+    Rendering stops early, returning the image so far, once time.monotonic()
+    passes `deadline` or `cancel.is_set()` returns True.
+    """
+    if block < 1 or block & (block - 1):
+        raise ValueError(f"block must be a power of two, not {block}")
+
+    def stopped() -> bool:
+        return (deadline is not None and time.monotonic() >= deadline) or (
+            cancel is not None and cancel.is_set()
+        )
+
+    canvas = Canvas(camera.hsize, camera.vsize)
+    previous = 0
+    size = block
+    while size:
+        for y in range(0, camera.vsize, size):
+            # Rows traced by the previous pass already have every other sample.
+            step = size * 2 if previous and y % previous == 0 else size
+            start = size if step > size else 0
+            height = min(size, camera.vsize - y)
+            for x in range(start, camera.hsize, step):
+                if stopped():
+                    return canvas
+                colour = colour_at(scene, camera.ray_for_pixel(x, y))
+                width = min(size, camera.hsize - x)
+                canvas.write_rect(x, y, width, height, [colour] * (width * height))
+        if callback is not None:
+            callback(canvas, size)
+        previous = size
+        size //= 2
+    return canvas
+
+
+# Per-process state for render_parallel's workers, set up once by _init_worker so
+# the scene and camera are only pickled once per worker rather than per tile.
+_worker: dict = {}
+
+
+def _init_worker(
+    scene: Scene, camera: Camera, shm_name: str, typecode: str, collecting: bool
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        scene=scene,
+        camera=camera,
+        shm=shm,
+        canvas=Canvas(camera.hsize, camera.vsize, typecode, data=shm.buf),
+        collecting=collecting,
+    )
+
+
+def _render_worker_tile(rect: Rect) -> stats.Stats | None:
+    args = _worker["scene"], _worker["camera"], _worker["canvas"], rect
+    if not _worker["collecting"]:
+        render_tile(*args)
+        return None
+    with stats.collect_stats() as tile_stats:
+        render_tile(*args)
+    return tile_stats
+
+
+def render_parallel(
+    scene: Scene,
+    camera: Camera,
+    workers: int | None = None,
+    tile: int = 64,
+    typecode: str = "d",
+) -> Canvas:
+    """
+    Render in a pool of processes, a tile at a time.
+
+    Workers write straight into a shared memory framebuffer, so no pixel data is
+    sent back through the pool. When statistics are being collected each worker
+    sends back its counts for each tile, which are merged into the active Stats.
+    """
+    collecting = stats.active()
+    workers = workers or os.cpu_count() or 1
+    canvas = Canvas(camera.hsize, camera.vsize, typecode)
+    shm = shared_memory.SharedMemory(create=True, size=canvas.buffer.nbytes)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(scene, camera, shm.name, typecode, collecting is not None),
+        ) as pool:
+            for tile_stats in pool.map(_render_worker_tile, camera.tiles(tile)):
+                if tile_stats is not None:
+                    collecting.merge(tile_stats)
+        canvas.buffer.cast("B")[:] = shm.buf[: canvas.buffer.nbytes]
+    finally:
+        shm.close()
+        shm.unlink()
+    return canvas
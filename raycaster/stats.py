@@ -0,0 +1,231 @@
+"""
+Opt-in render statistics.
+
+Inside a collect_stats() block the methods that cast rays, test intersections,
+invert matrices and allocate Intersections are swapped for counting wrappers.
+When no block is active the original methods are restored, so there is no
+overhead at all when statistics are not being collected.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Iterator, NamedTuple
+
+from .camera import Camera, Rect
+from .canvas import Canvas
+from .matrix import AffineMatrix, Matrix
+from .ray import Intersections, Ray, Sphere
+from .vector import Colour
+
+COUNTERS = ("rays", "intersection_tests", "hits", "inversions", "intersections")
+
+
+class TileStats(NamedTuple):
+    rect: Rect
+    seconds: float
+    intersection_tests: int
+
+
+class Stats:
+    """
+    Counters collected while rendering.
+
+    `intersections` counts Intersections objects allocated, and `pixel_cost`
+    maps (x, y) to the number of intersection tests made for that pixel.
+    """
+
+    def __init__(self) -> None:
+        self.rays = 0
+        self.intersection_tests = 0
+        self.hits = 0
+        self.inversions = 0
+        self.intersections = 0
+        self.tiles: list[TileStats] = []
+        self.pixel_cost: dict[tuple[int, int], int] = {}
+
+    @property
+    def misses(self) -> int:
+        return self.intersection_tests - self.hits
+
+    def counters(self) -> dict[str, int]:
+        counters = {name: getattr(self, name) for name in COUNTERS}
+        counters["misses"] = self.misses
+        return counters
+
+    def merge(self, other: Stats) -> None:
+        """Add another set of statistics, e.g. from a worker process, to these."""
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.tiles.extend(other.tiles)
+        self.pixel_cost.update(other.pixel_cost)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "counters": self.counters(),
+            "tile_seconds": sum(tile.seconds for tile in self.tiles),
+            "tiles": [tile._asdict() for tile in self.tiles],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.report(), indent=indent)
+
+    def save(self, path: os.PathLike) -> None:
+        with open(path, "w") as f:
+            f.write(self.to_json())
+            f.write("\n")
+
+    def heatmap(self, width: int, height: int) -> Canvas:
+        """
+        Returns a canvas shading each pixel by its cost relative to the most
+        expensive pixel, from black through red to yellow.
+        """
+        canvas = Canvas(width, height)
+        highest = max(self.pixel_cost.values(), default=0)
+        if not highest:
+            return canvas
+        for (x, y), cost in self.pixel_cost.items():
+            c = cost / highest
+            canvas.write(x, y, Colour(min(2 * c, 1), max(2 * c - 1, 0), 0))
+        return canvas
+
+
+_active: contextvars.ContextVar[Stats | None] = contextvars.ContextVar(
+    "raycaster_stats", default=None
+)
+_originals: list[tuple[type, str, Callable]] = []
+_blocks = 0
+_lock = threading.Lock()
+
+
+def active() -> Stats | None:
+    """Returns the statistics being collected in this context, if any."""
+    return _active.get()
+
+
+def _wrap(owner: type, name: str, make: Callable[[Callable], Callable]) -> None:
+    original = owner.__dict__[name]
+    _originals.append((owner, name, original))
+    setattr(owner, name, make(original))
+
+
+# The wrappers are installed on classes shared by every thread, so each checks
+# that this context is collecting before counting anything.
+
+
+def _count_rays(original):
+    def ray_through(self: Camera, x: float, y: float) -> Ray:
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.rays += 1
+        return original(self, x, y)
+
+    return ray_through
+
+
+def _count_bundle(original):
+    def bundle(self: Camera, rect: Rect | None = None):
+        result = original(self, rect)
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.rays += len(result)
+        return result
+
+    return bundle
+
+
+def _count_intersect(original):
+    def intersect(self: Ray, s: Sphere) -> Intersections:
+        xs = original(self, s)
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.intersection_tests += 1
+            if xs.count:
+                collecting.hits += 1
+        return xs
+
+    return intersect
+
+
+def _count_nearest_hit(original):
+    def nearest_hit(self: Sphere, ray: Ray, t_min=0, t_max=math.inf):
+        hit = original(self, ray, t_min, t_max)
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.intersection_tests += 1
+            if hit is not None:
+                collecting.hits += 1
+        return hit
+
+    return nearest_hit
+
+
+def _count_inverse(original):
+    def inverse(self):
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.inversions += 1
+        return original(self)
+
+    return inverse
+
+
+def _count_allocations(original):
+    def __init__(self, *intersections) -> None:
+        collecting = _active.get()
+        if collecting is not None:
+            collecting.intersections += 1
+        original(self, *intersections)
+
+    return __init__
+
+
+def _install() -> None:
+    _wrap(Camera, "ray_through", _count_rays)
+    _wrap(Camera, "bundle", _count_bundle)
+    _wrap(Ray, "intersect", _count_intersect)
+    _wrap(Sphere, "nearest_hit", _count_nearest_hit)
+    _wrap(Matrix, "inverse", _count_inverse)
+    _wrap(AffineMatrix, "inverse", _count_inverse)
+    _wrap(Intersections, "__init__", _count_allocations)
+
+
+def _uninstall() -> None:
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+@contextlib.contextmanager
+def collect_stats() -> Iterator[Stats]:
+    """
+    Collect statistics for everything rendered inside the block.
+
+    Blocks can be nested. An inner block's statistics are also added to the
+    enclosing one when it exits. Only work done in the current thread (or
+    asyncio task) is counted, so other threads rendering at the same time
+    don't affect the results. Work in other processes isn't counted either,
+    except that render_parallel collects each worker's statistics itself.
+    """
+    global _blocks
+    previous = _active.get()
+    stats = Stats()
+    with _lock:
+        if not _blocks:
+            _install()
+        _blocks += 1
+    token = _active.set(stats)
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+        if previous is not None:
+            previous.merge(stats)
+        with _lock:
+            _blocks -= 1
+            if not _blocks:
+                _uninstall()
@@ -1,59 +1,162 @@
+from __future__ import annotations
+
 import math
 
-from .matrix import Matrix
+from .cache import memoize
+from .matrix import FrozenMatrix, Matrix
+from .vector import Tuple
 
 
-def translation(x: float, y: float, z: float) -> Matrix:
-    mat = Matrix.identity()
-    mat[0, 3] = x
-    mat[1, 3] = y
-    mat[2, 3] = z
-    return mat
+@memoize
+def translation(x: float, y: float, z: float) -> FrozenMatrix:
+    # fmt: off
+    return FrozenMatrix((
+        1, 0, 0, x,
+        0, 1, 0, y,
+        0, 0, 1, z,
+        0, 0, 0, 1,
+    ))
+    # fmt: on
 
 
-def scaling(x: float, y: float, z: float) -> Matrix:
-    mat = Matrix.identity()
-    mat[0, 0] = x
-    mat[1, 1] = y
-    mat[2, 2] = z
-    return mat
+@memoize
+def scaling(x: float, y: float, z: float) -> FrozenMatrix:
+    # fmt: off
+    return FrozenMatrix((
+        x, 0, 0, 0,
+        0, y, 0, 0,
+        0, 0, z, 0,
+        0, 0, 0, 1,
+    ))
+    # fmt: on
 
 
-def rotation_x(r: float) -> Matrix:
-    mat = Matrix.identity()
-    mat[1, 1] = math.cos(r)
-    mat[1, 2] = -math.sin(r)
-    mat[2, 1] = math.sin(r)
-    mat[2, 2] = math.cos(r)
-    return mat
+@memoize
+def rotation_x(r: float) -> FrozenMatrix:
+    cos, sin = math.cos(r), math.sin(r)
+    # fmt: off
+    return FrozenMatrix((
+        1, 0,    0,   0,
+        0, cos, -sin, 0,
+        0, sin,  cos, 0,
+        0, 0,    0,   1,
+    ))
+    # fmt: on
 
 
-def rotation_y(r: float) -> Matrix:
-    mat = Matrix.identity()
-    mat[0, 0] = math.cos(r)
-    mat[0, 2] = math.sin(r)
-    mat[2, 0] = -math.sin(r)
-    mat[2, 2] = math.cos(r)
-    return mat
+@memoize
+def rotation_y(r: float) -> FrozenMatrix:
+    cos, sin = math.cos(r), math.sin(r)
+    # fmt: off
+    return FrozenMatrix((
+         cos, 0, sin, 0,
+         0,   1, 0,   0,
+        -sin, 0, cos, 0,
+         0,   0, 0,   1,
+    ))
+    # fmt: on
 
 
-def rotation_z(r: float) -> Matrix:
-    mat = Matrix.identity()
-    mat[0, 0] = math.cos(r)
-    mat[0, 1] = -math.sin(r)
-    mat[1, 0] = math.sin(r)
-    mat[1, 1] = math.cos(r)
-    return mat
+@memoize
+def rotation_z(r: float) -> FrozenMatrix:
+    cos, sin = math.cos(r), math.sin(r)
+    # fmt: off
+    return FrozenMatrix((
+        cos, -sin, 0, 0,
+        sin,  cos, 0, 0,
+        0,    0,   1, 0,
+        0,    0,   0, 1,
+    ))
+    # fmt: on
 
 
+@memoize
 def shearing(
     xy: float, xz: float, yx: float, yz: float, zx: float, zy: float
-) -> Matrix:
-    mat = Matrix.identity()
-    mat[0, 1] = xy
-    mat[0, 2] = xz
-    mat[1, 0] = yx
-    mat[1, 2] = yz
-    mat[2, 0] = zx
-    mat[2, 1] = zy
-    return mat
+) -> FrozenMatrix:
+    # fmt: off
+    return FrozenMatrix((
+        1,  xy, xz, 0,
+        yx, 1,  yz, 0,
+        zx, zy, 1,  0,
+        0,  0,  0,  1,
+    ))
+    # fmt: on
+
+
+def view_transform(from_: Tuple, to: Tuple, up: Tuple) -> Matrix:
+    forward = (to - from_).normalize()
+    left = forward.cross(up.normalize())
+    true_up = left.cross(forward)
+    # fmt: off
+    orientation = Matrix([
+        left.x,     left.y,     left.z,     0,
+        true_up.x,  true_up.y,  true_up.z,  0,
+        -forward.x, -forward.y, -forward.z, 0,
+        0,          0,          0,          1,
+    ])
+    # fmt: on
+    return orientation * translation(-from_.x, -from_.y, -from_.z)
+
+
+class Transform:
+    """
+    A transformation matrix that carries its inverse along with it.
+
+    Each step in a chain is applied after the ones before it, so
+    `Transform().rotate_x(r).scale(2, 2, 2).translate(1, 0, 0)` rotates, then
+    scales, then translates. Steps have known inverses, so the inverse is built
+    up alongside the matrix rather than computed from it.
+    """
+
+    __slots__ = ("matrix", "inverse")
+
+    def __init__(self, matrix: Matrix | None = None, inverse: Matrix | None = None):
+        self.matrix = Matrix.identity() if matrix is None else matrix
+        if inverse is None:
+            inverse = Matrix.identity() if matrix is None else matrix.inverse()
+        self.inverse = inverse
+
+    def then(self, matrix: Matrix, inverse: Matrix) -> Transform:
+        """Apply another transformation, given with its inverse, after this one."""
+        return Transform(matrix * self.matrix, self.inverse * inverse)
+
+    def __mul__(self, other: Transform) -> Transform:
+        if isinstance(other, Transform):
+            return Transform(self.matrix * other.matrix, other.inverse * self.inverse)
+        return NotImplemented
+
+    def inverted(self) -> Transform:
+        return Transform(self.inverse, self.matrix)
+
+    def translate(self, x: float, y: float, z: float) -> Transform:
+        return self.then(translation(x, y, z), translation(-x, -y, -z))
+
+    def scale(self, x: float, y: float, z: float) -> Transform:
+        return self.then(scaling(x, y, z), scaling(1 / x, 1 / y, 1 / z))
+
+    def rotate_x(self, r: float) -> Transform:
+        m = rotation_x(r)
+        return self.then(m, m.transpose())
+
+    def rotate_y(self, r: float) -> Transform:
+        m = rotation_y(r)
+        return self.then(m, m.transpose())
+
+    def rotate_z(self, r: float) -> Transform:
+        m = rotation_z(r)
+        return self.then(m, m.transpose())
+
+    def shear(
+        self, xy: float, xz: float, yx: float, yz: float, zx: float, zy: float
+    ) -> Transform:
+        m = shearing(xy, xz, yx, yz, zx, zy)
+        return self.then(m, m.inverse())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Transform):
+            return self.matrix == other.matrix
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Transform({self.matrix!r})"
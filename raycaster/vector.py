@@ -2,6 +2,35 @@ from __future__ import annotations
 
 import math
 import numbers
+from array import array
+from typing import Iterable, Iterator, TypeVar
+
+from .backend import get_backend
+
+T = TypeVar("T", bound="Tuple")
+
+
+def _is_number(n) -> bool:
+    # Check the common concrete types before the much slower ABC check.
+    return isinstance(n, (float, int, numbers.Number))
+
+
+_new = object.__new__
+
+
+def _make(cls: type[T], x: float, y: float, z: float, w: float) -> T:
+    """
+    Construct a tuple without __init__'s float() coercion.
+
+    Only for internal call sites whose values are already floats: arithmetic on
+    Tuples, matrices or array("d") data, and scalars passed through float().
+    """
+    t = _new(cls)
+    t.x = x
+    t.y = y
+    t.z = z
+    t.w = w
+    return t
 
 
 class Tuple:
@@ -20,53 +49,93 @@ class Tuple:
     def __add__(self, other: Tuple) -> Tuple:
         "Add the tuple's elements to another elementwise."
         if isinstance(other, self.__class__):
-            return self.__class__(
-                x=self.x + other.x,
-                y=self.y + other.y,
-                z=self.z + other.z,
-                w=self.w + other.w,
+            return _make(
+                self.__class__,
+                self.x + other.x,
+                self.y + other.y,
+                self.z + other.z,
+                self.w + other.w,
             )
         return NotImplemented
 
+    def __iadd__(self, other: Tuple) -> Tuple:
+        "Add another tuple's elements to this one's in place."
+        if isinstance(other, self.__class__):
+            self.x += other.x
+            self.y += other.y
+            self.z += other.z
+            self.w += other.w
+            return self
+        return NotImplemented
+
     def __getitem__(self, i: int) -> float:
         return (self.x, self.y, self.z, self.w)[i]
 
     def __sub__(self, other: Tuple) -> Tuple:
         "Subtract another tuple's elements elementwise."
         if isinstance(other, self.__class__):
-            return self.__class__(
-                x=self.x - other.x,
-                y=self.y - other.y,
-                z=self.z - other.z,
-                w=self.w - other.w,
+            return _make(
+                self.__class__,
+                self.x - other.x,
+                self.y - other.y,
+                self.z - other.z,
+                self.w - other.w,
             )
         return NotImplemented
 
+    def __isub__(self, other: Tuple) -> Tuple:
+        "Subtract another tuple's elements from this one's in place."
+        if isinstance(other, self.__class__):
+            self.x -= other.x
+            self.y -= other.y
+            self.z -= other.z
+            self.w -= other.w
+            return self
+        return NotImplemented
+
     def __mul__(self, other: float) -> Tuple:
         """Multiply the tuple's elements by a scalar."""
-        if isinstance(other, numbers.Number):
-            return self.__class__(
-                x=self.x * other,
-                y=self.y * other,
-                z=self.z * other,
-                w=self.w * other,
+        if _is_number(other):
+            if other.__class__ is not float:
+                other = float(other)
+            return _make(
+                self.__class__,
+                self.x * other,
+                self.y * other,
+                self.z * other,
+                self.w * other,
             )
         return NotImplemented
 
+    def __imul__(self, other: float) -> Tuple:
+        """Multiply the tuple's elements by a scalar in place."""
+        if _is_number(other):
+            if other.__class__ is not float:
+                other = float(other)
+            self.x *= other
+            self.y *= other
+            self.z *= other
+            self.w *= other
+            return self
+        return NotImplemented
+
     def __truediv__(self, other: float) -> Tuple:
         """Divide the tuple's elements by a scalar."""
-        if isinstance(other, numbers.Number):
-            return self.__class__(
-                x=self.x / other,
-                y=self.y / other,
-                z=self.z / other,
-                w=self.w / other,
+        if _is_number(other):
+            if other.__class__ is not float:
+                other = float(other)
+            return _make(
+                self.__class__,
+                self.x / other,
+                self.y / other,
+                self.z / other,
+                self.w / other,
             )
         return NotImplemented
 
     def __neg__(self) -> Tuple:
         """Negate the tuple's elements."""
-        return self.__class__(x=-self.x, y=-self.y, z=-self.z, w=-self.w)
+        return _make(self.__class__, -self.x, -self.y, -self.z, -self.w)
 
     def dot(self, other: Tuple) -> float:
         """Calculates the dot product of the tuple."""
@@ -77,11 +146,12 @@ class Tuple:
         assert not self.is_point()
 
         total = (self.x**2 + self.y**2 + self.z**2) ** 0.5
-        return self.__class__(
-            x=self.x / total,
-            y=self.y / total,
-            z=self.z / total,
-            w=self.w / total,
+        return _make(
+            self.__class__,
+            self.x / total,
+            self.y / total,
+            self.z / total,
+            self.w / total,
         )
 
     def magnitude(self) -> float:
@@ -94,11 +164,12 @@ class Tuple:
         """Calculates the cross product of two vectors."""
         assert not self.is_point()
 
-        return self.__class__(
+        return _make(
+            self.__class__,
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x,
-            0,
+            0.0,
         )
 
     def is_close(self, other: Tuple, abs_tol: float = 1e-5) -> bool:
@@ -147,13 +218,25 @@ class Colour(Tuple):
     def __mul__(self, other):
         """Calculates the hadamard product of two colours."""
         if isinstance(other, self.__class__):
-            return self.__class__(
+            return _make(
+                self.__class__,
                 self.x * other.x,
                 self.y * other.y,
                 self.z * other.z,
+                0.0,
             )
         return super().__mul__(other)
 
+    def __imul__(self, other):
+        """Calculates the hadamard product of two colours in place."""
+        if isinstance(other, self.__class__):
+            self.x *= other.x
+            self.y *= other.y
+            self.z *= other.z
+            self.w = 0.0
+            return self
+        return super().__imul__(other)
+
     def __repr__(self) -> str:
         return f"Colour(r={self.x:.2f}, g={self.y:.2f}, b={self.z:.2f})"
 
@@ -164,3 +247,150 @@ def point(x: float = 0, y: float = 0, z: float = 0):
 
 def vector(x: float = 0, y: float = 0, z: float = 0):
     return Tuple(x, y, z, 0)
+
+
+def madd(a: T, b: Tuple, s: float) -> T:
+    """Returns a + b * s, with a single allocation."""
+    if s.__class__ is not float:
+        s = float(s)
+    return _make(
+        a.__class__, a.x + b.x * s, a.y + b.y * s, a.z + b.z * s, a.w + b.w * s
+    )
+
+
+def lerp(a: T, b: Tuple, t: float) -> T:
+    """Interpolates linearly from a (at t=0) to b (at t=1)."""
+    if t.__class__ is not float:
+        t = float(t)
+    return _make(
+        a.__class__,
+        a.x + (b.x - a.x) * t,
+        a.y + (b.y - a.y) * t,
+        a.z + (b.z - a.z) * t,
+        a.w + (b.w - a.w) * t,
+    )
+
+
+class TupleArray:
+    """
+    A contiguous array of tuples, stored as x, y, z, w doubles.
+
+    Arithmetic applies to every element at once. Indexing returns a copy of an
+    element as a Tuple (or `cls`, e.g. Colour); assign to an index to update it.
+    """
+
+    __slots__ = ("data", "cls")
+
+    def __init__(self, data: Iterable[float] = (), cls: type[Tuple] = Tuple) -> None:
+        self.data = array("d", data)
+        self.cls = cls
+        if len(self.data) % 4:
+            raise ValueError("TupleArray data must be a multiple of 4 values")
+
+    @classmethod
+    def from_tuples(
+        cls, tuples: Iterable[Tuple], kind: type[Tuple] | None = None
+    ) -> TupleArray:
+        tuples = list(tuples)
+        if kind is None:
+            kind = tuples[0].__class__ if tuples else Tuple
+        data = array("d")
+        for t in tuples:
+            data.extend((t.x, t.y, t.z, t.w))
+        return cls(data, kind)
+
+    def _new(self, data: Iterable[float]) -> TupleArray:
+        return TupleArray(data, self.cls)
+
+    def __len__(self) -> int:
+        return len(self.data) // 4
+
+    def _offset(self, n: int) -> int:
+        if not -len(self) <= n < len(self):
+            raise IndexError("TupleArray index out of range")
+        return (n % len(self)) * 4
+
+    def __getitem__(self, n: int) -> Tuple:
+        i = self._offset(n)
+        d = self.data
+        return _make(self.cls, d[i], d[i + 1], d[i + 2], d[i + 3])
+
+    def __setitem__(self, n: int, t: Tuple) -> None:
+        i = self._offset(n)
+        self.data[i : i + 4] = array("d", (t.x, t.y, t.z, t.w))
+
+    def __iter__(self) -> Iterator[Tuple]:
+        cls = self.cls
+        d = self.data
+        return (
+            _make(cls, d[i], d[i + 1], d[i + 2], d[i + 3]) for i in range(0, len(d), 4)
+        )
+
+    def _operand(self, other: TupleArray | Tuple) -> array | None:
+        if isinstance(other, TupleArray):
+            if len(other) != len(self):
+                raise ValueError("TupleArrays must be the same length")
+            return other.data
+        if isinstance(other, Tuple):
+            return array("d", (other.x, other.y, other.z, other.w)) * len(self)
+        return None
+
+    def _scalars(self, other: float | Iterable[float]) -> array | float | None:
+        if _is_number(other):
+            return float(other)  # type: ignore
+        if isinstance(other, (TupleArray, Tuple, str)):
+            return None
+        scalars = other if isinstance(other, array) else array("d", other)
+        if len(scalars) != len(self):
+            raise ValueError("Need one scalar per element")
+        return scalars
+
+    def _binary(self, op: str, values: array | float | None) -> TupleArray:
+        if values is None:
+            return NotImplemented
+        return self._new(get_backend().binary(op, self.data, values))
+
+    def _scale(self, op: str, scalars: array | float | None) -> TupleArray:
+        if isinstance(scalars, array):
+            return self._new(get_backend().scale4(op, self.data, scalars))
+        return self._binary(op, scalars)
+
+    def __add__(self, other: TupleArray | Tuple) -> TupleArray:
+        """Add another array elementwise, or the same tuple to every element."""
+        return self._binary("add", self._operand(other))
+
+    def __sub__(self, other: TupleArray | Tuple) -> TupleArray:
+        return self._binary("sub", self._operand(other))
+
+    def __mul__(self, other: float | Iterable[float]) -> TupleArray:
+        """Multiply by a scalar, or each element by its own scalar."""
+        return self._scale("mul", self._scalars(other))
+
+    def __truediv__(self, other: float | Iterable[float]) -> TupleArray:
+        return self._scale("truediv", self._scalars(other))
+
+    def __neg__(self) -> TupleArray:
+        return self._binary("mul", -1.0)
+
+    def dot(self, other: TupleArray | Tuple) -> array:
+        """The dot product of each pair of elements."""
+        return get_backend().dot4(self.data, self._operand(other))
+
+    def magnitude(self) -> array:
+        """The magnitude of each element, treated as a vector."""
+        return get_backend().magnitude3(self.data)
+
+    def normalize(self) -> TupleArray:
+        return self / self.magnitude()
+
+    def cross(self, other: TupleArray | Tuple) -> TupleArray:
+        """The cross product of each pair of elements, treated as vectors."""
+        return self._new(get_backend().cross3(self.data, self._operand(other)))
+
+    def is_close(self, other: TupleArray, abs_tol: float = 1e-5) -> bool:
+        return len(self) == len(other) and all(
+            math.isclose(a, b, abs_tol=abs_tol) for a, b in zip(self.data, other.data)
+        )
+
+    def __repr__(self) -> str:
+        return f"TupleArray({list(self)!r})"
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+from .bounds import Bounds, inverse_direction
+from .ray import Intersection, Intersections, Ray, Sphere
+
+BINS = 12
+TRAVERSAL_COST = 1.0
+INTERSECTION_COST = 1.0
+
+
+class BVHNode:
+    __slots__ = ("bounds", "left", "right", "shapes")
+
+    def __init__(
+        self,
+        bounds: Bounds,
+        left: BVHNode | None = None,
+        right: BVHNode | None = None,
+        shapes: list[Sphere] | None = None,
+    ) -> None:
+        self.bounds = bounds
+        self.left = left
+        self.right = right
+        self.shapes = shapes
+
+    def is_leaf(self) -> bool:
+        return self.shapes is not None
+
+
+def _bounds_of(shapes: Iterable[Sphere]) -> Bounds:
+    bounds = Bounds()
+    for shape in shapes:
+        bounds = bounds.union(shape.bounds)
+    return bounds
+
+
+def build_bvh(shapes: list[Sphere], max_leaf_size: int = 4) -> BVHNode:
+    """Build a bounding volume hierarchy using a binned surface area heuristic."""
+    bounds = _bounds_of(shapes)
+    if len(shapes) <= 1:
+        return BVHNode(bounds, shapes=shapes)
+
+    centroids = Bounds()
+    centres = {}
+    for shape in shapes:
+        c = shape.bounds.centre()
+        centres[id(shape)] = (c.x, c.y, c.z)
+        centroids.add_point(c.x, c.y, c.z)
+
+    extents = (
+        centroids.max_x - centroids.min_x,
+        centroids.max_y - centroids.min_y,
+        centroids.max_z - centroids.min_z,
+    )
+    axis = max(range(3), key=lambda i: extents[i])
+    if extents[axis] == 0:
+        # All centres coincide, so no split can separate them.
+        return BVHNode(bounds, shapes=shapes)
+    lo = (centroids.min_x, centroids.min_y, centroids.min_z)[axis]
+    scale = BINS / extents[axis]
+
+    def bin_of(shape: Sphere) -> int:
+        return min(int((centres[id(shape)][axis] - lo) * scale), BINS - 1)
+
+    bin_bounds = [Bounds() for _ in range(BINS)]
+    bin_counts = [0] * BINS
+    for shape in shapes:
+        b = bin_of(shape)
+        bin_bounds[b] = bin_bounds[b].union(shape.bounds)
+        bin_counts[b] += 1
+
+    # Sweep from both ends to get the bounds and counts either side of each split.
+    left_bounds, left_area, left_counts = Bounds(), [], []
+    right_bounds, right_area, right_counts = Bounds(), [], []
+    left_count = right_count = 0
+    for i in range(BINS - 1):
+        left_bounds = left_bounds.union(bin_bounds[i])
+        left_count += bin_counts[i]
+        left_area.append(left_bounds.surface_area())
+        left_counts.append(left_count)
+
+        right_bounds = right_bounds.union(bin_bounds[BINS - 1 - i])
+        right_count += bin_counts[BINS - 1 - i]
+        right_area.append(right_bounds.surface_area())
+        right_counts.append(right_count)
+    right_area.reverse()
+    right_counts.reverse()
+
+    best_cost, best_split = math.inf, 0
+    parent_area = max(bounds.surface_area(), 1e-12)
+    for i in range(BINS - 1):
+        if not left_counts[i] or not right_counts[i]:
+            continue
+        cost = (
+            TRAVERSAL_COST
+            + INTERSECTION_COST
+            * (left_area[i] * left_counts[i] + right_area[i] * right_counts[i])
+            / parent_area
+        )
+        if cost < best_cost:
+            best_cost, best_split = cost, i + 1
+
+    if len(shapes) <= max_leaf_size and best_cost >= INTERSECTION_COST * len(shapes):
+        return BVHNode(bounds, shapes=shapes)
+
+    left_shapes = [s for s in shapes if bin_of(s) < best_split]
+    right_shapes = [s for s in shapes if bin_of(s) >= best_split]
+    return BVHNode(
+        bounds,
+        left=build_bvh(left_shapes, max_leaf_size),
+        right=build_bvh(right_shapes, max_leaf_size),
+    )
+
+
+class World:
+    """
+    A collection of shapes, intersected through a bounding volume hierarchy.
+
+    The hierarchy is built from the shapes' bounds on first use. It is rebuilt
+    after add(), but changing a shape's transform once it is in the world
+    leaves it stale, so call invalidate() afterwards.
+    """
+
+    def __init__(self, shapes: Iterable[Sphere] = (), max_leaf_size: int = 4) -> None:
+        self.shapes = list(shapes)
+        self.max_leaf_size = max_leaf_size
+        self._bvh: BVHNode | None = None
+
+    def add(self, *shapes: Sphere) -> None:
+        self.shapes.extend(shapes)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Rebuild the hierarchy on next use, e.g. after moving a shape."""
+        self._bvh = None
+
+    @property
+    def bvh(self) -> BVHNode:
+        """The hierarchy, rebuilt lazily after shapes are added."""
+        if self._bvh is None:
+            self._bvh = build_bvh(self.shapes, self.max_leaf_size)
+        return self._bvh
+
+    def candidates(
+        self, ray: Ray, t_min: float = -math.inf, t_max: float = math.inf
+    ) -> Iterable[Sphere]:
+        """Yield the shapes in leaves whose bounds the ray passes through."""
+        origin = ray.origin
+        inv = inverse_direction(ray.direction)
+        stack = [self.bvh]
+        while stack:
+            node = stack.pop()
+            if node.bounds.hit_range(origin, inv, t_min, t_max) is None:
+                continue
+            if node.shapes is not None:
+                yield from node.shapes
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+    def intersect(self, ray: Ray) -> Intersections:
+        xs: list[Intersection] = []
+        for shape in self.candidates(ray):
+            xs.extend(ray.intersect(shape).intersections)
+        return Intersections(*xs)
+
+    def nearest_hit(
+        self, ray: Ray, t_min: float = 0, t_max: float = math.inf
+    ) -> tuple[float, Sphere] | None:
+        origin = ray.origin
+        inv = inverse_direction(ray.direction)
+        nearest = None
+        stack = [self.bvh]
+        while stack:
+            node = stack.pop()
+            # t_max shrinks as hits are found, pruning anything further away.
+            if node.bounds.hit_range(origin, inv, t_min, t_max) is None:
+                continue
+            if node.shapes is not None:
+                for shape in node.shapes:
+                    hit = shape.nearest_hit(ray, t_min, t_max)
+                    if hit is not None:
+                        nearest = hit
+                        t_max = hit[0]
+                continue
+
+            left = node.left.bounds.hit_range(origin, inv, t_min, t_max)
+            right = node.right.bounds.hit_range(origin, inv, t_min, t_max)
+            if left is None:
+                if right is not None:
+                    stack.append(node.right)
+            elif right is None:
+                stack.append(node.left)
+            elif left[0] <= right[0]:
+                stack.append(node.right)
+                stack.append(node.left)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        return nearest
+
+    def occluded(self, ray: Ray, max_distance: float = math.inf) -> bool:
+        """Returns True as soon as any shape is hit between 0 and max_distance."""
+        origin = ray.origin
+        inv = inverse_direction(ray.direction)
+        stack = [self.bvh]
+        while stack:
+            node = stack.pop()
+            if node.bounds.hit_range(origin, inv, 0, max_distance) is None:
+                continue
+            if node.shapes is not None:
+                for shape in node.shapes:
+                    # A shape's own box is cheaper to reject than its quadratic.
+                    if shape.bounds.hit_range(origin, inv, 0, max_distance) is None:
+                        continue
+                    if shape.occluded(ray, max_distance):
+                        return True
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        return False
@@ -0,0 +1,12 @@
+import pytest
+
+from raycaster import backend
+
+
+@pytest.fixture(autouse=True, params=["python", "numpy"])
+def compute_backend(request: pytest.FixtureRequest):
+    """Run every test against each compute backend."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    with backend.use_backend(request.param) as b:
+        yield b
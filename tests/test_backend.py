@@ -0,0 +1,92 @@
+from array import array
+
+import pytest
+
+from raycaster import backend
+
+
+class TestBackendSelection:
+    def test_unknown(self) -> None:
+        with pytest.raises(ValueError):
+            backend.set_backend("fortran")
+
+    def test_use_backend_restores(self) -> None:
+        current = backend.get_backend()
+        with backend.use_backend("python") as b:
+            assert backend.get_backend() is b
+            assert b.name == "python"
+        assert backend.get_backend() is current
+
+    def test_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(backend, "_current", None)
+        monkeypatch.setenv(backend.ENV_VAR, "python")
+        assert backend.get_backend().name == "python"
+
+        monkeypatch.setattr(backend, "_current", None)
+        monkeypatch.setenv(backend.ENV_VAR, "nope")
+        with pytest.raises(ValueError):
+            backend.get_backend()
+
+    def test_register(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(backend, "_factories", dict(backend._factories))
+
+        class Custom(backend.PythonBackend):
+            name = "custom"
+
+        backend.register_backend("custom", Custom)
+        assert "custom" in backend.available_backends()
+        with backend.use_backend("custom") as b:
+            assert isinstance(b, Custom)
+
+
+class TestOperations:
+    def test_binary(self, compute_backend: backend.Backend) -> None:
+        a = array("d", [1, 2, 3, 4])
+        b = array("d", [4, 3, 2, 1])
+        assert compute_backend.binary("add", a, b).tolist() == [5, 5, 5, 5]
+        assert compute_backend.binary("sub", a, b).tolist() == [-3, -1, 1, 3]
+        assert compute_backend.binary("mul", a, 2.0).tolist() == [2, 4, 6, 8]
+        assert compute_backend.binary("truediv", a, 2.0).tolist() == [0.5, 1, 1.5, 2]
+
+    def test_scale4(self, compute_backend: backend.Backend) -> None:
+        a = array("d", [1, 2, 3, 4, 5, 6, 7, 8])
+        scalars = array("d", [2, 0.5])
+        product = compute_backend.scale4("mul", a, scalars)
+        assert product.tolist() == [2, 4, 6, 8, 2.5, 3, 3.5, 4]
+        quotient = compute_backend.scale4("truediv", a, scalars)
+        assert quotient.tolist() == [0.5, 1, 1.5, 2, 10, 12, 14, 16]
+
+    def test_results_are_arrays(self, compute_backend: backend.Backend) -> None:
+        a = array("d", [3, 4, 0, 0])
+        assert isinstance(compute_backend.dot4(a, a), array)
+        assert compute_backend.magnitude3(a).tolist() == [5]
+
+    def test_quantize(self, compute_backend: backend.Backend) -> None:
+        values = array("d", [-1, 0, 0.5, 0.25, 1, 2])
+        assert compute_backend.quantize(values) == bytes([0, 0, 128, 64, 255, 255])
+
+    def test_matches_python(self, compute_backend: backend.Backend) -> None:
+        python = backend.PythonBackend()
+        m = array("d", [2, 0, 0, 1, 0, 3, 0, 2, 0, 0, 4, 3, 0, 0, 0, 1])
+        a = array("d", [1, 2, 3, -4, 0.5, 6])
+        for w in (0, 1):
+            assert compute_backend.transform(m, a, w) == python.transform(m, a, w)
+        assert compute_backend.normalize3(a) == pytest.approx(python.normalize3(a))
+        q = array("d", [1, 2, 3, 0, -4, 0.5, 6, 0])
+        assert compute_backend.cross3(q, q[::-1]) == python.cross3(q, q[::-1])
+
+    def test_zero_division(self, compute_backend: backend.Backend) -> None:
+        zero = array("d", [1, 2, 3, 0, 0, 0])
+        with pytest.raises(ZeroDivisionError):
+            compute_backend.normalize3(zero)
+        with pytest.raises(ZeroDivisionError):
+            compute_backend.binary("truediv", zero, 0.0)
+        with pytest.raises(ZeroDivisionError):
+            compute_backend.binary("truediv", zero, array("d", [1, 1, 1, 1, 0, 1]))
+        with pytest.raises(ZeroDivisionError):
+            compute_backend.scale4("truediv", zero[:4], array("d", [0]))
+
+        identity = array("d", [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])
+        origins = array("d", [0, 0, 0, 0, 0, -5])
+        with pytest.raises(ZeroDivisionError):
+            compute_backend.intersect_spheres(identity, origins, zero)
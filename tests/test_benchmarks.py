@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks import __main__ as cli
+from benchmarks import suite
+from raycaster import backend
+
+
+@pytest.fixture(autouse=True)
+def compute_backend():
+    """
+    The harness doesn't depend on the compute backend, so unlike the rest of
+    the suite these tests only run once, with the default backend.
+    """
+    yield backend.get_backend()
+
+
+@pytest.fixture
+def registered():
+    """Register a trivial benchmark, removing it again afterwards."""
+    suite.benchmark("test.noop", repeat=1)(lambda: lambda: None)
+    yield suite.benchmarks["test.noop"]
+    del suite.benchmarks["test.noop"]
+
+
+def result(name: str, best: float) -> suite.Result:
+    return suite.Result(name, best, best, 1, 1)
+
+
+class TestSuite:
+    def test_duplicate_name(self, registered: suite.Benchmark) -> None:
+        with pytest.raises(ValueError):
+            suite.benchmark("test.noop")(lambda: lambda: None)
+
+    def test_select(self, registered: suite.Benchmark) -> None:
+        assert suite.select(r"^test\.noop$") == [registered]
+        assert registered in suite.select()
+
+    def test_measure(self, registered: suite.Benchmark) -> None:
+        r = suite.measure(registered, number=10)
+        assert r.name == "test.noop"
+        assert r.repeat == 1
+        assert r.number == 10
+        assert 0 < r.best <= r.mean
+
+    def test_save_load(self, tmp_path: Path) -> None:
+        suite.save([result("a", 1.5), result("b", 2e-6)], tmp_path / "r.json")
+        assert suite.load(tmp_path / "r.json") == {"a": 1.5, "b": 2e-6}
+
+    def test_compare(self) -> None:
+        changes = suite.compare(
+            [result("a", 1.05), result("b", 1.2), result("new", 1)],
+            {"a": 1, "b": 1, "gone": 1},
+        )
+        assert [c.name for c in changes] == ["a", "b"]
+        assert changes[1].ratio == pytest.approx(1.2)
+        assert suite.regressions(changes, 0.1) == [changes[1]]
+        assert suite.regressions(changes, 0.25) == []
+        assert suite.regressions(changes, 0.01) == changes
+
+
+class TestMain:
+    def run(self, *args: str) -> int:
+        return cli.main(
+            ["-k", r"^test\.noop$", "--repeat", "1", "--number", "10", *args]
+        )
+
+    def test_no_baseline(self, registered: suite.Benchmark, tmp_path: Path) -> None:
+        assert self.run("--baseline", str(tmp_path / "missing.json")) == 0
+
+    def test_save_baseline(self, registered: suite.Benchmark, tmp_path: Path) -> None:
+        baseline = tmp_path / "baseline.json"
+        output = tmp_path / "output.json"
+        assert self.run("--baseline", str(baseline), "--save-baseline") == 0
+        args = "--baseline", str(baseline), "--output", str(output)
+        assert self.run(*args, "--threshold", "1e12") == 0
+        assert set(suite.load(baseline)) == set(suite.load(output)) == {"test.noop"}
+
+    def test_regression_exit_status(
+        self, registered: suite.Benchmark, tmp_path: Path
+    ) -> None:
+        baseline = tmp_path / "baseline.json"
+        suite.save([result("test.noop", 1e-15)], baseline)
+        assert self.run("--baseline", str(baseline)) == 1
+        assert self.run("--baseline", str(baseline), "--threshold", "1e12") == 0
+
+        suite.save([result("test.noop", 1.0)], baseline)
+        assert self.run("--baseline", str(baseline)) == 0
@@ -0,0 +1,48 @@
+import math
+
+from raycaster.bounds import Bounds, inverse_direction
+from raycaster.transformation import rotation_z, scaling, translation
+from raycaster.vector import point, vector
+
+
+class TestBounds:
+    def test_empty(self) -> None:
+        b = Bounds()
+        assert b.is_empty()
+        assert b.surface_area() == 0
+
+        b.add_point(1, 2, 3)
+        assert not b.is_empty()
+        assert b.minimum == point(1, 2, 3)
+        assert b.maximum == point(1, 2, 3)
+
+    def test_union(self) -> None:
+        a = Bounds(-1, -2, -3, 1, 2, 3)
+        b = Bounds(0, 0, 0, 4, 5, 1)
+        assert a.union(b) == Bounds(-1, -2, -3, 4, 5, 3)
+        assert Bounds().union(b) == b
+
+    def test_centre_and_area(self) -> None:
+        b = Bounds(0, 0, 0, 1, 2, 3)
+        assert b.centre() == point(0.5, 1, 1.5)
+        assert b.surface_area() == 22
+
+    def test_transform(self) -> None:
+        b = Bounds(-1, -1, -1, 1, 1, 1)
+        assert b.transform(translation(1, 2, 3)) == Bounds(0, 1, 2, 2, 3, 4)
+        assert b.transform(scaling(2, 3, 4)) == Bounds(-2, -3, -4, 2, 3, 4)
+
+        r = 2**0.5
+        assert b.transform(rotation_z(math.pi / 4)) == Bounds(-r, -r, -1, r, r, 1)
+
+    def test_hit_range(self) -> None:
+        b = Bounds(-1, -1, -1, 1, 1, 1)
+        inv = inverse_direction(vector(0, 0, 1))
+        assert b.hit_range(point(0, 0, -5), inv) == (4, 6)
+        assert b.hit_range(point(0, 0, -5), inv, 0, 5) == (4, 5)
+        assert b.hit_range(point(0, 0, -5), inv, 0, 3) is None
+        assert b.hit_range(point(0, 2, -5), inv) is None
+
+        inv = inverse_direction(vector(-1, -1, 0))
+        assert b.hit_range(point(2, 2, 0), inv) == (1, 3)
+        assert b.hit_range(point(2, 2, 5), inv) is None
@@ -0,0 +1,104 @@
+import pytest
+
+from raycaster import transformation
+from raycaster.cache import (
+    CacheInfo,
+    LRUCache,
+    cache_info,
+    caches,
+    get_cache,
+    memoize,
+    set_cache_size,
+)
+from raycaster.matrix import Matrix
+
+
+class TestLRUCache:
+    def test_hits_and_misses(self) -> None:
+        cache = LRUCache(2)
+        assert cache.get_or_compute("a", lambda: 1) == 1
+        assert cache.get_or_compute("a", lambda: 2) == 1
+        assert cache.info() == CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("a", lambda: -1) == 1
+        assert cache.get_or_compute("b", lambda: -2) == -2
+        assert cache.info().currsize == 2
+
+    def test_resize_and_clear(self) -> None:
+        cache = LRUCache(4)
+        for i in range(4):
+            cache.get_or_compute(i, lambda i=i: i)
+        cache.resize(1)
+        assert cache.info().currsize == 1
+
+        cache.resize(0)
+        assert cache.get_or_compute("a", lambda: 1) == 1
+        assert cache.get_or_compute("a", lambda: 2) == 2
+        assert cache.info().currsize == 0
+
+        cache.clear()
+        assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+
+    def test_memoize(self) -> None:
+        calls = []
+
+        @memoize
+        def double(x: int) -> int:
+            calls.append(x)
+            return x * 2
+
+        double.cache.clear()  # type: ignore
+        assert double(2) == 4
+        assert double(2) == 4
+        assert double(3) == 6
+        assert calls == [2, 3]
+        name = f"{__name__}.{double.__qualname__}"
+        assert double.cache is get_cache(name)  # type: ignore
+        assert cache_info()[name].hits == 1
+
+    def test_memoize_keywords(self) -> None:
+        calls = []
+
+        @memoize
+        def add(x: int, y: int = 1, *, z: int = 0) -> int:
+            calls.append((x, y, z))
+            return x + y + z
+
+        add.cache.clear()  # type: ignore
+        assert add(1, 2) == 3
+        assert add(x=1, y=2) == 3
+        assert add(1, y=2) == 3
+        assert add(1, 2, z=3) == 6
+        assert add(1, 2, z=3) == 6
+        assert calls == [(1, 2, 0), (1, 2, 3)]
+
+        with pytest.raises(TypeError):
+            add(1, w=2)
+
+    def test_memoize_same_name(self) -> None:
+        def translation(x: float, y: float, z: float) -> tuple:
+            return x, y, z
+
+        translation.__qualname__ = "translation"
+        translation.__module__ = "elsewhere"
+        mine = memoize(translation)
+        assert mine(1, 2, 3) == (1, 2, 3)
+        assert isinstance(transformation.translation(1, 2, 3), Matrix)
+        assert transformation.translation(x=1, y=2, z=3) == (
+            transformation.translation(1, 2, 3)
+        )
+
+    def test_set_cache_size(self) -> None:
+        try:
+            set_cache_size(10)
+            assert all(c.maxsize == 10 for c in caches.values())
+            assert get_cache("test_set_cache_size").maxsize == 10
+        finally:
+            set_cache_size(1024)
@@ -0,0 +1,89 @@
+import math
+
+from raycaster.camera import Camera
+from raycaster.matrix import Matrix
+from raycaster.transformation import Transform, rotation_y, translation
+from raycaster.vector import point, vector
+
+
+class TestCamera:
+    def test_create(self) -> None:
+        c = Camera(160, 120, math.pi / 2)
+        assert c.hsize == 160
+        assert c.vsize == 120
+        assert c.field_of_view == math.pi / 2
+        assert c.transform == Matrix.identity()
+
+    def test_pixel_size_horizontal(self) -> None:
+        c = Camera(200, 125, math.pi / 2)
+        assert math.isclose(c.pixel_size, 0.01)
+
+    def test_pixel_size_vertical(self) -> None:
+        c = Camera(125, 200, math.pi / 2)
+        assert math.isclose(c.pixel_size, 0.01)
+
+    def test_ray_through_centre(self) -> None:
+        c = Camera(201, 101, math.pi / 2)
+        r = c.ray_for_pixel(100, 50)
+        assert r.origin == point(0, 0, 0)
+        assert r.direction.is_close(vector(0, 0, -1))
+
+    def test_ray_through_corner(self) -> None:
+        c = Camera(201, 101, math.pi / 2)
+        r = c.ray_for_pixel(0, 0)
+        assert r.origin == point(0, 0, 0)
+        assert r.direction.is_close(vector(0.66519, 0.33259, -0.66851))
+
+    def test_ray_transformed_camera(self) -> None:
+        c = Camera(201, 101, math.pi / 2)
+        c.transform = rotation_y(math.pi / 4) * translation(0, -2, 5)
+        r = c.ray_for_pixel(100, 50)
+        assert r.origin.is_close(point(0, 2, -5))
+        assert r.direction.is_close(vector((2**0.5) / 2, 0, -(2**0.5) / 2))
+
+    def test_rays_do_not_share_origin(self) -> None:
+        c = Camera(11, 11, math.pi / 2)
+        r = c.ray_for_pixel(0, 0)
+        r.origin += vector(1, 0, 0)
+        assert c.ray_for_pixel(5, 5).origin == point(0, 0, 0)
+        assert c.origin == point(0, 0, 0)
+
+    def test_transform_builder(self) -> None:
+        c = Camera(201, 101, math.pi / 2)
+        c.transform = Transform().translate(0, -2, 5).rotate_y(math.pi / 4)
+        r = c.ray_for_pixel(100, 50)
+        assert r.origin.is_close(point(0, 2, -5))
+        assert r.direction.is_close(vector((2**0.5) / 2, 0, -(2**0.5) / 2))
+
+    def test_tiles(self) -> None:
+        c = Camera(5, 3, math.pi / 2)
+        assert list(c.tiles(2)) == [
+            (0, 0, 2, 2),
+            (2, 0, 2, 2),
+            (4, 0, 1, 2),
+            (0, 2, 2, 1),
+            (2, 2, 2, 1),
+            (4, 2, 1, 1),
+        ]
+        assert list(c.scanlines()) == [(0, 0, 5, 1), (0, 1, 5, 1), (0, 2, 5, 1)]
+
+    def test_rays(self) -> None:
+        c = Camera(5, 3, math.pi / 2)
+        rays = list(c.rays((1, 1, 2, 2)))
+        assert [(px, py) for px, py, _ in rays] == [(1, 1), (2, 1), (1, 2), (2, 2)]
+        for px, py, r in rays:
+            assert r.direction == c.ray_for_pixel(px, py).direction
+
+        assert len(list(c.rays())) == 15
+
+    def test_bundle(self) -> None:
+        c = Camera(11, 7, math.pi / 3)
+        c.transform = rotation_y(0.4) * translation(1, -2, 5)
+        b = c.bundle((2, 3, 4, 2))
+        assert len(b) == 8
+        expected = [r for _, _, r in c.rays((2, 3, 4, 2))]
+        for r1, r2 in zip(b, expected):
+            assert r1.origin == r2.origin
+            assert r1.direction == r2.direction
+
+        assert len(c.bundle()) == 77
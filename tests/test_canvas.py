@@ -1,6 +1,9 @@
+import io
+from pathlib import Path
+
 import pytest
 
-from raycaster.canvas import Canvas
+from raycaster.canvas import Canvas, MappedCanvas
 from raycaster.vector import Colour
 
 
@@ -53,6 +56,68 @@ class TestCanvas:
         with pytest.raises(TypeError):
             c.write(0, 0.5, col)  # type: ignore
 
+    def test_float32_canvas(self) -> None:
+        c = Canvas(4, 3, typecode="f")
+        assert c.buffer.itemsize == 4
+        c.write(3, 2, Colour(0.5, 0.25, 1))
+        assert c.get(3, 2) == Colour(0.5, 0.25, 1)
+
+        with pytest.raises(ValueError):
+            Canvas(4, 3, typecode="i")
+
+    def test_buffer(self) -> None:
+        c = Canvas(3, 2)
+        assert len(c.buffer) == 3 * 2 * 3
+        assert c.buffer.format == "d"
+
+        c.write(1, 1, Colour(0.1, 0.2, 0.3))
+        assert c.buffer[12:15].tolist() == [0.1, 0.2, 0.3]
+
+        c.buffer[0] = 0.7
+        assert c.get(0, 0) == Colour(0.7, 0, 0)
+
+    def test_external_data(self) -> None:
+        data = bytearray(8 * 2 * 2 * 3 + 16)
+        c = Canvas(2, 2, data=data)
+        c.write(1, 0, Colour(0.25, 0.5, 0.75))
+        c.write_row(1, [Colour(1, 1, 1), Colour(1, 1, 1)])
+        assert c.get(1, 0) == Colour(0.25, 0.5, 0.75)
+        assert Canvas(2, 2, data=data).get(1, 1) == Colour(1, 1, 1)
+
+        with pytest.raises(ValueError):
+            Canvas(3, 3, data=data)
+
+    def test_write_rect(self) -> None:
+        c = Canvas(4, 4)
+        colours = [Colour(x, y, 0) for y in range(2) for x in range(3)]
+        c.write_rect(1, 2, 3, 2, colours)
+
+        assert c.get(0, 2) == Colour(0, 0, 0)
+        assert c.get(1, 2) == Colour(0, 0, 0)
+        assert c.get(2, 2) == Colour(1, 0, 0)
+        assert c.get(3, 3) == Colour(2, 1, 0)
+        assert c.get(1, 1) == Colour(0, 0, 0)
+
+        with pytest.raises(IndexError):
+            c.write_rect(2, 2, 3, 2, colours)
+
+        with pytest.raises(ValueError):
+            c.write_rect(0, 0, 2, 2, colours)
+
+    def test_write_row(self) -> None:
+        c = Canvas(3, 2)
+        c.write_row(1, [Colour(1, 0, 0), Colour(0, 1, 0), Colour(0, 0, 1)])
+        assert c.get(0, 1) == Colour(1, 0, 0)
+        assert c.get(2, 1) == Colour(0, 0, 1)
+        assert c.get(0, 0) == Colour(0, 0, 0)
+
+        c.write_row(0, [Colour(0.5, 0.5, 0.5)], x=2)
+        assert c.get(2, 0) == Colour(0.5, 0.5, 0.5)
+        assert c.get(1, 0) == Colour(0, 0, 0)
+
+        with pytest.raises(IndexError):
+            c.write_row(0, [Colour(0, 0, 0)] * 2, x=2)
+
     def test_ppm(self) -> None:
         c = Canvas(2, 1)
 
@@ -85,3 +150,101 @@ class TestCanvas:
             "255 204 153 255 204 153 255 204 153 255 204 153\n",
         ]
         assert c.as_ppm_string().endswith("\n")
+
+    def test_save_ppm(self, tmp_path: Path) -> None:
+        c = Canvas(9, 2)
+        c.write(0, 0, Colour(-0.1, 0.456, 1.1))
+        c.write(8, 1, Colour(0.5, 0.5, 0.5))
+
+        c.save_ppm(tmp_path / "p3.ppm")
+        assert (tmp_path / "p3.ppm").read_bytes() == c.as_ppm_string().encode()
+
+        c.save_ppm(tmp_path / "p6.ppm", format="p6")
+        data = (tmp_path / "p6.ppm").read_bytes()
+        assert data.startswith(b"P6\n9 2\n255\n")
+        body = data[len(b"P6\n9 2\n255\n") :]
+        assert len(body) == 9 * 2 * 3
+        assert body[:3] == bytes([0, 116, 255])
+        assert body[-3:] == bytes([128, 128, 128])
+        assert body[3:-3] == bytes(len(body) - 6)
+
+    def test_write_ppm(self) -> None:
+        c = Canvas(2, 1)
+        c.write(1, 0, Colour(1, 0.8, 0.6))
+
+        f = io.BytesIO()
+        c.write_ppm(f)
+        assert f.getvalue() == b"P3\n2 1\n255\n0 0 0 255 204 153\n"
+
+        f = io.BytesIO()
+        c.write_ppm(f, format="p6")
+        assert f.getvalue() == b"P6\n2 1\n255\n\x00\x00\x00\xff\xcc\x99"
+
+        with pytest.raises(ValueError):
+            c.write_ppm(io.BytesIO(), format="p7")
+
+
+class TestMappedCanvas:
+    def test_create(self, tmp_path: Path) -> None:
+        with MappedCanvas(tmp_path / "image.ppm", 4, 3) as c:
+            assert c.width == 4
+            assert c.height == 3
+            assert c.get(3, 2) == Colour(0, 0, 0)
+            assert len(c.buffer) == 4 * 3 * 3
+        assert (tmp_path / "image.ppm").read_bytes() == b"P6\n4 3\n255\n" + bytes(36)
+
+    def test_read_write(self, tmp_path: Path) -> None:
+        with MappedCanvas(tmp_path / "image.ppm", 3, 2) as c:
+            c.write(2, 1, Colour(1, 0.2, 0))
+            assert c.get(2, 1) == Colour(1, 51 / 255, 0)
+            c.write(0, 0, Colour(-0.5, 0.5, 2))
+            assert c.get(0, 0) == Colour(0, 128 / 255, 1)
+
+            with pytest.raises(IndexError):
+                c.write(3, 0, Colour(0, 0, 0))
+            with pytest.raises(IndexError):
+                c.get(0, 2)
+
+    def test_write_rect(self, tmp_path: Path) -> None:
+        colours = [Colour(x / 2, y / 2, 0) for y in range(2) for x in range(3)]
+        with MappedCanvas(tmp_path / "image.ppm", 4, 4) as c:
+            c.write_rect(1, 2, 3, 2, colours)
+            assert c.get(1, 2) == Colour(0, 0, 0)
+            assert c.get(3, 3) == Colour(1, 128 / 255, 0)
+            assert c.get(0, 3) == Colour(0, 0, 0)
+
+            with pytest.raises(IndexError):
+                c.write_rect(2, 2, 3, 2, colours)
+            with pytest.raises(ValueError):
+                c.write_rect(0, 0, 2, 2, colours)
+
+    def test_matches_canvas_ppm(self, tmp_path: Path) -> None:
+        plain = Canvas(9, 2)
+        with MappedCanvas(tmp_path / "image.ppm", 9, 2) as c:
+            for canvas in (plain, c):
+                canvas.write(0, 0, Colour(-0.1, 0.456, 1.1))
+                canvas.write_row(1, [Colour(0.5, 0.25, 0.75)] * 9)
+
+            assert c.as_ppm_string() == plain.as_ppm_string()
+            f = io.BytesIO()
+            plain.write_ppm(f, format="p6")
+        assert (tmp_path / "image.ppm").read_bytes() == f.getvalue()
+
+    def test_open(self, tmp_path: Path) -> None:
+        path = tmp_path / "image.ppm"
+        with MappedCanvas(path, 5, 4) as c:
+            c.write(4, 3, Colour(1, 1, 1))
+
+        with MappedCanvas.open(path) as c:
+            assert (c.width, c.height) == (5, 4)
+            assert c.get(4, 3) == Colour(1, 1, 1)
+            c.write(0, 0, Colour(1, 0, 0))
+        assert path.read_bytes()[len(b"P6\n5 4\n255\n") :][:3] == b"\xff\x00\x00"
+
+        (tmp_path / "p3.ppm").write_text("P3\n1 1\n255\n0 0 0\n")
+        with pytest.raises(ValueError):
+            MappedCanvas.open(tmp_path / "p3.ppm")
+
+        (tmp_path / "short.ppm").write_bytes(b"P6\n5 4\n255\n" + bytes(10))
+        with pytest.raises(ValueError):
+            MappedCanvas.open(tmp_path / "short.ppm")
@@ -1,5 +1,11 @@
-from raycaster.matrix import Matrix
-from raycaster.vector import Tuple
+import math
+from array import array
+
+import pytest
+
+from raycaster.matrix import AffineMatrix, FrozenMatrix, Matrix
+from raycaster.transformation import rotation_x, scaling, shearing, translation
+from raycaster.vector import Tuple, point, vector
 
 
 class TestMatrix:
@@ -137,6 +143,20 @@ class TestMatrix:
         b = Tuple(1, 2, 3, 1)
         assert a * b == Tuple(18, 24, 33, 1)
 
+    def test_transform_point_vector(self) -> None:
+        # fmt: off
+        a = Matrix([
+            1, 2, 3, 4,
+            2, 4, 4, 2,
+            8, 6, 4, 1,
+            0, 0, 0, 1,
+        ])
+        # fmt: on
+        assert a.transform_point(Tuple(1, 2, 3, 1)) == Tuple(18, 24, 33, 1)
+        assert a.transform_point(Tuple(1, 2, 3, 1)) == a * Tuple(1, 2, 3, 1)
+        assert a.transform_vector(Tuple(1, 2, 3, 0)) == Tuple(14, 22, 32, 0)
+        assert a.transform_vector(Tuple(1, 2, 3, 0)) == a * Tuple(1, 2, 3, 0)
+
     def test_multiply_identity(self) -> None:
         # fmt: off
         a = Matrix([
@@ -368,6 +388,59 @@ class TestMatrix:
         c = a * b
         assert c * b.inverse() == a
 
+    def test_inverse_not_invertible(self) -> None:
+        # fmt: off
+        a = Matrix([
+            -4,  2, -2, -3,
+             9,  6,  2,  6,
+             0, -5,  1, -5,
+             0,  0,  0,  0,
+        ])
+        # fmt: on
+        with pytest.raises(ZeroDivisionError):
+            a.inverse()
+
+        b = Matrix([1, 2, 3, 4, 5] * 5)
+        assert b.determinant() == 0
+        with pytest.raises(ZeroDivisionError):
+            b.inverse()
+
+    def test_determinant_5x5(self) -> None:
+        # fmt: off
+        a = Matrix([
+             2, -1,  0,  3,  1,
+             1,  4, -2,  0,  5,
+             0,  3,  1, -1,  2,
+             6,  0,  2,  1, -3,
+            -2,  1,  5,  4,  0,
+        ])
+        # fmt: on
+        assert math.isclose(a.determinant(), 651)
+        assert math.isclose(
+            a.determinant(),
+            sum(a.cofactor(0, pos) * el for pos, el in enumerate(a[0])),
+        )
+
+    def test_inverse_6x6(self) -> None:
+        # fmt: off
+        a = Matrix([
+             3,  1, -2,  0,  4,  1,
+             0,  2,  5, -1,  1,  3,
+             4, -3,  1,  2,  0,  2,
+             1,  0, -1,  3,  2, -2,
+             2,  5,  0,  1, -4,  1,
+            -1,  2,  3,  0,  1,  4,
+        ])
+        # fmt: on
+        assert math.isclose(a.determinant(), -9985)
+        b = a.inverse()
+        product = Matrix(
+            sum(a[row, i] * b[i, col] for i in range(6))
+            for row in range(6)
+            for col in range(6)
+        )
+        assert product.is_close(Matrix([float(i % 7 == 0) for i in range(36)]))
+
     def test_repr(self) -> None:
         m = Matrix(range(16))
         assert repr(m) == (
@@ -376,3 +449,158 @@ class TestMatrix:
             " 8.00   9.00   10.00  11.00  \n"
             " 12.00  13.00  14.00  15.00]"
         )
+
+
+class TestApply:
+    def matrix(self) -> Matrix:
+        return translation(1, -2, 3) * rotation_x(0.7) * scaling(2, 0.5, 3)
+
+    def test_tuples(self) -> None:
+        m = self.matrix()
+        points = [point(1, 2, 3), point(-1, 0, 4)]
+        vectors = [vector(1, 2, 3), vector(-1, 0, 4)]
+        assert m.apply_points(points) == [m * p for p in points]
+        assert m.apply_vectors(iter(vectors)) == [m * v for v in vectors]
+        for empty in ([], iter([]), array("d")):
+            for result in (m.apply_points(empty), m.apply_vectors(empty)):
+                assert isinstance(result, array)
+                assert len(result) == 0
+
+    def test_flat(self) -> None:
+        m = self.matrix()
+        flat = array("d", [1, 2, 3, -1, 0, 4])
+        res = m.apply_points(flat)
+        assert isinstance(res, array)
+        assert Tuple(*res[:3], 1) == m * point(1, 2, 3)
+        assert Tuple(*res[3:], 1) == m * point(-1, 0, 4)
+
+        res = m.apply_vectors([1, 2, 3, -1, 0, 4])
+        assert Tuple(*res[:3], 0) == m * vector(1, 2, 3)
+        assert Tuple(*res[3:], 0) == m * vector(-1, 0, 4)
+
+        assert flat.tolist() == [1, 2, 3, -1, 0, 4]
+
+        with pytest.raises(ValueError):
+            m.apply_points([1, 2])
+
+    def test_numpy(self) -> None:
+        np = pytest.importorskip("numpy")
+        m = self.matrix()
+        xyz = np.array([[1, 2, 3], [-1, 0, 4]], dtype=float)
+        xyzw = np.array([[1, 2, 3, 1], [-1, 0, 4, 1]], dtype=float)
+        expected = np.array([[*(m * point(1, 2, 3))], [*(m * point(-1, 0, 4))]])
+        assert np.allclose(m.apply_points(xyz), expected[:, :3])
+        assert np.allclose(m.apply_points(xyzw), expected)
+
+        expected = np.array([[*(m * vector(1, 2, 3))], [*(m * vector(-1, 0, 4))]])
+        assert np.allclose(m.apply_vectors(xyz), expected[:, :3])
+        # The w column is ignored, so points given to apply_vectors aren't moved.
+        assert np.allclose(m.apply_vectors(xyzw), expected)
+        assert np.allclose(m.apply_points(xyzw * [1, 1, 1, 0]), m.apply_points(xyzw))
+
+        with pytest.raises(ValueError):
+            m.apply_points(np.zeros(3))
+
+
+class TestFrozenMatrix:
+    def test_freeze(self) -> None:
+        m = Matrix(range(16))
+        f = m.freeze()
+        assert isinstance(f, FrozenMatrix)
+        assert f == m
+        assert m == f
+        assert f.freeze() is f
+
+        with pytest.raises(TypeError):
+            f[0, 0] = 1
+
+    def test_hash(self) -> None:
+        a = FrozenMatrix(range(16))
+        b = FrozenMatrix(range(16))
+        assert hash(a) == hash(b)
+        assert len({a, b, FrozenMatrix(range(1, 17))}) == 2
+
+    def test_arithmetic(self) -> None:
+        a = FrozenMatrix(translation(1, 2, 3).data)
+        m = Matrix(scaling(2, 2, 2).data)
+        assert a * m == translation(1, 2, 3) * scaling(2, 2, 2)
+        assert m * a == scaling(2, 2, 2) * translation(1, 2, 3)
+        assert a * point(1, 1, 1) == point(2, 3, 4)
+        assert FrozenMatrix([1, 2, 3, 4, 5] * 5).determinant() == 0
+
+    def test_derived_matrices_are_plain(self) -> None:
+        a, b = translation(1, 2, 3), scaling(2, 2, 2)
+        for m in (a * b, b * a, a * Matrix(b.data), Matrix(a.data) * b):
+            assert type(m) is Matrix
+        m = a * b
+        m[0, 0] = 5
+        assert m[0, 0] == 5
+        assert type(FrozenMatrix([1, 2, 3, 4]).submatrix(0, 0)) is Matrix
+
+    def test_inverse_transpose_cached(self) -> None:
+        # fmt: off
+        a = FrozenMatrix([
+             8, -5,  9,  2,
+             7,  5,  6,  1,
+            -6,  0,  9,  6,
+            -3,  0, -9, -4,
+        ])
+        # fmt: on
+        assert a.inverse() == Matrix(a.data).inverse()
+        assert a.inverse() is a.inverse()
+        assert FrozenMatrix(a.data).inverse() is a.inverse()
+        assert a.transpose() == Matrix(a.data).transpose()
+        assert a.transpose() is a.transpose()
+        # Cached results are shared, so they mustn't be mutable.
+        assert isinstance(a.inverse(), FrozenMatrix)
+        assert isinstance(a.transpose(), FrozenMatrix)
+
+
+class TestAffineMatrix:
+    def affine(self) -> Matrix:
+        return (
+            translation(1, -2, 3)
+            * rotation_x(0.7)
+            * scaling(2, 0.5, 3)
+            * shearing(0.5, 0, 0, 1, 0, 0.3)
+        )
+
+    def test_convert(self) -> None:
+        m = self.affine()
+        a = AffineMatrix.from_matrix(m)
+        assert len(a.data) == 12
+        assert a.to_matrix() == m
+        assert AffineMatrix.identity().to_matrix() == Matrix.identity()
+
+        with pytest.raises(ValueError):
+            AffineMatrix.from_matrix(Matrix(range(16)))
+
+        with pytest.raises(ValueError):
+            AffineMatrix(range(16))
+
+    def test_multiply(self) -> None:
+        m1 = self.affine()
+        m2 = translation(4, 5, 6) * rotation_x(-1.1)
+        a = AffineMatrix.from_matrix(m1) * AffineMatrix.from_matrix(m2)
+        assert a.to_matrix() == m1 * m2
+
+    def test_multiply_tuple(self) -> None:
+        m = self.affine()
+        a = AffineMatrix.from_matrix(m)
+        for t in (point(1, 2, 3), vector(1, 2, 3), Tuple(1, 2, 3, 4)):
+            assert a * t == m * t
+        assert a.transform_point(point(1, 2, 3)) == m * point(1, 2, 3)
+        assert a.transform_vector(vector(1, 2, 3)) == m * vector(1, 2, 3)
+
+    def test_inverse(self) -> None:
+        m = self.affine()
+        a = AffineMatrix.from_matrix(m)
+        assert math.isclose(a.determinant(), m.determinant())
+        assert a.inverse().to_matrix().is_close(m.inverse())
+        assert (a * a.inverse()).is_close(AffineMatrix.identity())
+
+        with pytest.raises(ZeroDivisionError):
+            AffineMatrix.from_matrix(scaling(1, 0, 1)).inverse()
+
+    def test_repr(self) -> None:
+        assert repr(AffineMatrix.identity()).startswith("AffineMatrix([1.00")
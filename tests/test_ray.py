@@ -1,6 +1,24 @@
+import math
+
+import pytest
+
+from raycaster.backend import use_backend
 from raycaster.matrix import Matrix
-from raycaster.ray import Intersection, Intersections, Ray, Sphere
-from raycaster.transformation import scaling, translation
+from raycaster.ray import (
+    Intersection,
+    Intersections,
+    Ray,
+    RayBundle,
+    Sphere,
+    intersect_many,
+)
+from raycaster.transformation import (
+    Transform,
+    rotation_x,
+    scaling,
+    shearing,
+    translation,
+)
 from raycaster.vector import point, vector
 
 
@@ -35,6 +53,71 @@ class TestRay:
         assert r2.direction == vector(0, 3, 0)
 
 
+class TestRayBundle:
+    def test_create(self) -> None:
+        b = RayBundle([1, 2, 3, 4, 5, 6], [0, 0, 1, 0, 1, 0])
+        assert len(b) == 2
+        assert b[0].origin == point(1, 2, 3)
+        assert b[0].direction == vector(0, 0, 1)
+        assert b[-1].origin == point(4, 5, 6)
+        assert b[-1].direction == vector(0, 1, 0)
+
+        with pytest.raises(IndexError):
+            b[2]
+
+        with pytest.raises(ValueError):
+            RayBundle([1, 2, 3], [0, 0])
+
+    def test_from_rays(self) -> None:
+        rays = [
+            Ray(point(1, 2, 3), vector(0, 1, 0)),
+            Ray(point(-1, 0, 5), vector(1, 2, 3)),
+        ]
+        b = RayBundle.from_rays(rays)
+        assert len(b) == 2
+        for r1, r2 in zip(b, rays):
+            assert r1.origin == r2.origin
+            assert r1.direction == r2.direction
+
+    def test_position(self) -> None:
+        b = RayBundle([2, 3, 4, 0, 0, 0], [1, 0, 0, 0, 0, 2])
+        assert b.position([2.5, -1]).tolist() == [4.5, 3, 4, 0, 0, -2]
+
+    def test_transform(self) -> None:
+        rays = [
+            Ray(point(1, 2, 3), vector(0, 1, 0)),
+            Ray(point(-1, 0, 5), vector(1, 2, 3)),
+        ]
+        t = translation(3, 4, 5) * rotation_x(0.3) * scaling(2, 3, 4)
+        b = RayBundle.from_rays(rays).transform(t)
+        for r1, r2 in zip(b, rays):
+            r2 = r2.transform(t)
+            assert r1.origin == r2.origin
+            assert r1.direction == r2.direction
+
+    def test_normalize(self) -> None:
+        b = RayBundle([1, 2, 3, 4, 5, 6], [4, 0, 0, 1, 2, 3]).normalize()
+        assert b[0].origin == point(1, 2, 3)
+        assert b[0].direction == vector(1, 0, 0)
+        assert b[1].direction == vector(1, 2, 3).normalize()
+
+    def test_intersect(self) -> None:
+        rays = [
+            Ray(point(0, 0, -5), vector(0, 0, 1)),
+            Ray(point(0, 3, -5), vector(0, 0, 1)),
+            Ray(point(1, 1, 0), vector(1, 2, 3)),
+        ]
+        s = Sphere()
+        s.set_transform(translation(0.5, 0, 0) * scaling(2, 2, 2))
+        t0, t1, hit = RayBundle.from_rays(rays).intersect(s)
+        assert list(hit) == [1, 0, 1]
+        assert math.isnan(t0[1]) and math.isnan(t1[1])
+        for i in (0, 2):
+            xs = rays[i].intersect(s)
+            assert t0[i] == pytest.approx(xs[0].t)
+            assert t1[i] == pytest.approx(xs[1].t)
+
+
 class TestSphere:
     def test_create_sphere(self) -> None:
         s = Sphere()
@@ -51,6 +134,34 @@ class TestSphere:
         s.set_transform(t2)
         assert s.transform == t2
 
+    def test_singular_transform(self) -> None:
+        s = Sphere()
+        s.set_transform(translation(1, 0, 0))
+        with pytest.raises(ZeroDivisionError):
+            s.set_transform(scaling(0, 1, 1))
+        assert s.transform == translation(1, 0, 0)
+        assert s.inverse == translation(-1, 0, 0)
+
+    def test_set_transform_builder(self) -> None:
+        s = Sphere()
+        t = Transform().scale(2, 2, 2).translate(1, 0, 0)
+        s.set_transform(t)
+        assert s.transform == t.matrix
+        assert s.inverse is t.inverse
+        assert s.determinant == 8
+
+    def test_transform_caches_inverse(self) -> None:
+        s = Sphere()
+        assert s.inverse == Matrix.identity()
+        assert s.inverse_transpose == Matrix.identity()
+        assert s.determinant == 1
+
+        t = scaling(2, 4, 8)
+        s.transform = t
+        assert s.inverse == t.inverse()
+        assert s.inverse_transpose == t.inverse().transpose()
+        assert s.determinant == 64
+
 
 class TestIntersections:
     def test_create_intersection(self) -> None:
@@ -108,6 +219,22 @@ class TestIntersect:
         assert xs[0].t == -6
         assert xs[1].t == -4
 
+    def test_scaled_sphere(self) -> None:
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        s = Sphere()
+        s.set_transform(scaling(2, 2, 2))
+        xs = r.intersect(s)
+        assert xs.count == 2
+        assert xs[0].t == 3
+        assert xs[1].t == 7
+
+    def test_translated_sphere(self) -> None:
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        s = Sphere()
+        s.set_transform(translation(5, 0, 0))
+        xs = r.intersect(s)
+        assert xs.count == 0
+
     def test_object_is_set(self) -> None:
         r = Ray(point(0, 0, -5), vector(0, 0, 1))
         s = Sphere()
@@ -151,3 +278,113 @@ class TestHit:
         xs = Intersections(i1, i2, i3, i4)
         i = xs.hit()
         assert i == i4
+
+
+class TestNearestHit:
+    def test_outside(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert r.nearest_hit(s) == (4, s)
+
+    def test_inside(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, 0), vector(0, 0, 1))
+        assert r.nearest_hit(s) == (1, s)
+
+    def test_behind(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, 5), vector(0, 0, 1))
+        assert r.nearest_hit(s) is None
+
+    def test_miss(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 2, -5), vector(0, 0, 1))
+        assert r.nearest_hit(s) is None
+
+    def test_range(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert r.nearest_hit(s, t_max=4) is None
+        assert r.nearest_hit(s, t_min=4) == (6, s)
+        assert r.nearest_hit(s, t_min=-10) == (4, s)
+
+    def test_transformed(self) -> None:
+        s = Sphere()
+        s.set_transform(translation(0, 0, 1) * scaling(2, 2, 2))
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert r.nearest_hit(s) == (4, s)
+        assert r.nearest_hit(s)[0] == r.intersect(s).hit().t
+
+
+class TestOccluded:
+    def test_occluded(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert s.occluded(r)
+        assert s.occluded(r, 4.5)
+        assert not s.occluded(r, 4)
+
+    def test_not_occluded(self) -> None:
+        s = Sphere()
+        assert not s.occluded(Ray(point(0, 2, -5), vector(0, 0, 1)))
+        assert not s.occluded(Ray(point(0, 0, 5), vector(0, 0, 1)))
+
+
+class TestIntersectMany:
+    def test_matches_scalar(self) -> None:
+        np = pytest.importorskip("numpy")
+
+        s = Sphere()
+        s.set_transform(translation(0.5, 0, 0) * shearing(0.5, 0, 0, 0, 0, 0.3))
+        rays = [
+            Ray(point(x / 4, y / 4, -5), vector(0.01 * x, 0.02 * y, 1))
+            for x in range(-8, 9)
+            for y in range(-8, 9)
+        ]
+        origins = np.array([[r.origin.x, r.origin.y, r.origin.z, 1] for r in rays])
+        directions = np.array(
+            [[r.direction.x, r.direction.y, r.direction.z, 0] for r in rays]
+        )
+
+        t0, t1, hit = intersect_many(origins, directions, s)
+        assert hit.any()
+        assert not hit.all()
+        for i, r in enumerate(rays):
+            xs = r.intersect(s)
+            assert hit[i] == (xs.count == 2)
+            if hit[i]:
+                assert math.isclose(t0[i], xs[0].t, abs_tol=1e-9)
+                assert math.isclose(t1[i], xs[1].t, abs_tol=1e-9)
+            else:
+                assert np.isnan(t0[i])
+                assert np.isnan(t1[i])
+
+    def test_same_under_each_backend(self) -> None:
+        np = pytest.importorskip("numpy")
+
+        s = Sphere()
+        s.set_transform(scaling(2, 1, 1))
+        rays = [Ray(point(x / 2, 0.5, -5), vector(0.1 * x, 0, 1)) for x in range(-6, 7)]
+        bundle = RayBundle.from_rays(rays)
+        origins = np.array(bundle.origins).reshape(-1, 3)
+        directions = np.array(bundle.directions).reshape(-1, 3)
+
+        results = {}
+        for name in ("python", "numpy"):
+            with use_backend(name):
+                results[name] = intersect_many(origins, directions, s)
+                expected = bundle.intersect(s)
+            t0, t1, hit = results[name]
+            assert hit.tolist() == [bool(h) for h in expected[2]]
+            assert np.allclose(t0, expected[0], equal_nan=True)
+            assert np.allclose(t1, expected[1], equal_nan=True)
+        for a, b in zip(results["python"], results["numpy"]):
+            assert np.array_equal(a, b, equal_nan=True)
+
+    def test_zero_direction(self) -> None:
+        np = pytest.importorskip("numpy")
+
+        origins = np.array([[0.0, 0, 0, 1]])
+        directions = np.zeros((1, 4))
+        with pytest.raises(ZeroDivisionError):
+            intersect_many(origins, directions, Sphere())
@@ -0,0 +1,213 @@
+import io
+import math
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from raycaster import stats
+from raycaster.camera import Camera
+from raycaster.canvas import Canvas, MappedCanvas
+from raycaster.ray import Ray, Sphere
+from raycaster.render import (
+    BACKGROUND,
+    colour_at,
+    render,
+    render_adaptive,
+    render_parallel,
+    render_progressive,
+    render_to_stream,
+    sample_at,
+)
+from raycaster.transformation import scaling, view_transform
+from raycaster.vector import Colour, point, vector
+
+
+def make_scene() -> tuple[Sphere, Camera]:
+    s = Sphere()
+    s.set_transform(scaling(1, 0.5, 1))
+    camera = Camera(
+        20,
+        15,
+        math.pi / 3,
+        view_transform(point(0, 0, -5), point(0, 0, 0), vector(0, 1, 0)),
+    )
+    return s, camera
+
+
+class TestRender:
+    def test_colour_at_miss(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, -5), vector(0, 1, 0))
+        assert colour_at(s, r) == Colour(0, 0, 0)
+
+    def test_colour_at_hit(self) -> None:
+        s = Sphere()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert colour_at(s, r) == Colour(0.5, 0.5, 0)
+
+    def test_miss_colour_is_a_copy(self) -> None:
+        s = Sphere()
+        c = colour_at(s, Ray(point(0, 0, -5), vector(0, 1, 0)))
+        c += Colour(1, 0, 0)
+        assert colour_at(s, Ray(point(0, 0, -5), vector(0, 1, 0))) == Colour(0, 0, 0)
+        assert BACKGROUND == Colour(0, 0, 0)
+
+    def test_render(self) -> None:
+        s, camera = make_scene()
+        canvas = render(s, camera, tile=4)
+        assert canvas.width == 20
+        assert canvas.height == 15
+        for x, y, ray in camera.rays():
+            assert canvas.get(x, y) == colour_at(s, ray)
+
+    def test_render_into(self, tmp_path: Path) -> None:
+        s, camera = make_scene()
+        with MappedCanvas(tmp_path / "image.ppm", 20, 15) as canvas:
+            assert render(s, camera, tile=8, canvas=canvas) is canvas
+        expected = io.BytesIO()
+        render(s, camera).write_ppm(expected, format="p6")
+        assert (tmp_path / "image.ppm").read_bytes() == expected.getvalue()
+
+        with pytest.raises(ValueError):
+            render(s, camera, canvas=Canvas(15, 20))
+
+    def test_render_parallel(self) -> None:
+        s, camera = make_scene()
+        canvas = render_parallel(s, camera, workers=2, tile=8)
+        assert canvas.buffer.tobytes() == render(s, camera).buffer.tobytes()
+
+
+class TestRenderProgressive:
+    def test_matches_render(self) -> None:
+        s, camera = make_scene()
+        canvas = render_progressive(s, camera, block=4)
+        assert canvas.buffer.tobytes() == render(s, camera).buffer.tobytes()
+
+    def test_passes(self) -> None:
+        s, camera = make_scene()
+        passes = []
+
+        def callback(canvas, size: int) -> None:
+            passes.append(size)
+            for x, y, _ in camera.rays():
+                sample = camera.ray_for_pixel(x - x % size, y - y % size)
+                assert canvas.get(x, y) == colour_at(s, sample)
+
+        render_progressive(s, camera, block=8, callback=callback)
+        assert passes == [8, 4, 2, 1]
+
+    def test_traces_each_pixel_once(self) -> None:
+        s, camera = make_scene()
+        traced = []
+        ray_for_pixel = camera.ray_for_pixel
+
+        def record(x: int, y: int):
+            traced.append((x, y))
+            return ray_for_pixel(x, y)
+
+        camera.ray_for_pixel = record  # type: ignore
+        render_progressive(s, camera, block=16)
+        assert sorted(traced) == sorted((x, y) for x, y, _ in camera.rays())
+
+    def test_cancel(self) -> None:
+        s, camera = make_scene()
+        cancel = threading.Event()
+        coarse = []
+
+        def callback(canvas, size: int) -> None:
+            coarse.append(canvas.buffer.tobytes())
+            cancel.set()
+
+        canvas = render_progressive(
+            s, camera, block=4, callback=callback, cancel=cancel
+        )
+        assert canvas.buffer.tobytes() == coarse[0]
+
+    def test_deadline(self) -> None:
+        s, camera = make_scene()
+        canvas = render_progressive(s, camera, deadline=time.monotonic())
+        assert not any(canvas.buffer)
+
+    def test_block_size(self) -> None:
+        s, camera = make_scene()
+        with pytest.raises(ValueError):
+            render_progressive(s, camera, block=6)
+
+
+class TestRenderAdaptive:
+    def test_sample_at(self) -> None:
+        s = Sphere()
+        assert sample_at(s, Ray(point(0, 0, -5), vector(0, 1, 0))) == (
+            Colour(0, 0, 0),
+            None,
+        )
+        assert sample_at(s, Ray(point(0, 0, -5), vector(0, 0, 1))) == (
+            Colour(0.5, 0.5, 0),
+            s,
+        )
+
+    def test_flat_image(self) -> None:
+        s, camera = make_scene()
+        s.set_transform(scaling(0.01, 0.01, 0.01))
+        canvas, extra = render_adaptive(s, camera)
+        assert extra == 0
+        assert canvas.buffer.tobytes() == render(s, camera).buffer.tobytes()
+
+    def test_edges_only(self) -> None:
+        s, camera = make_scene()
+        plain = render(s, camera)
+        canvas, extra = render_adaptive(s, camera, threshold=0.1, max_depth=1)
+        changed = [
+            (x, y) for x, y, _ in camera.rays() if canvas.get(x, y) != plain.get(x, y)
+        ]
+        assert changed
+        assert extra % 4 == 0
+        assert len(changed) <= extra // 4 < camera.hsize * camera.vsize
+        # The background in the corners is far from any edge.
+        assert canvas.get(0, 0) == Colour(0, 0, 0)
+
+    def test_depth(self) -> None:
+        s, camera = make_scene()
+        _, shallow = render_adaptive(s, camera, max_depth=1)
+        _, deep = render_adaptive(s, camera, max_depth=3)
+        _, none = render_adaptive(s, camera, max_depth=0)
+        assert none == 0
+        assert shallow < deep <= shallow * (1 + 4 + 16)
+
+    def test_counts_rays(self) -> None:
+        s, camera = make_scene()
+        with stats.collect_stats() as collected:
+            _, extra = render_adaptive(s, camera)
+        assert collected.rays == camera.hsize * camera.vsize + extra
+
+
+class TestRenderToStream:
+    def test_matches_render(self) -> None:
+        s, camera = make_scene()
+        for format in ("p3", "p6"):
+            expected = io.BytesIO()
+            render(s, camera).write_ppm(expected, format)
+            f = io.BytesIO()
+            render_to_stream(s, camera, f, format)
+            assert f.getvalue() == expected.getvalue()
+
+    def test_writes_rows(self) -> None:
+        s, camera = make_scene()
+        writes = []
+
+        class Stream(io.BytesIO):
+            def flush(self) -> None:
+                writes.append(self.tell())
+
+        render_to_stream(s, camera, Stream())
+        header = len(b"P6\n20 15\n255\n")
+        assert writes == [header + row * 20 * 3 for row in range(1, 16)]
+
+    def test_format(self) -> None:
+        s, camera = make_scene()
+        f = io.BytesIO()
+        with pytest.raises(ValueError):
+            render_to_stream(s, camera, f, format="p7")
+        assert f.getvalue() == b""
@@ -0,0 +1,166 @@
+import json
+import math
+import threading
+
+from raycaster import stats
+from raycaster.camera import Camera
+from raycaster.matrix import Matrix
+from raycaster.ray import Ray, Sphere
+from raycaster.render import render, render_parallel
+from raycaster.transformation import scaling, translation, view_transform
+from raycaster.vector import Colour, point, vector
+from raycaster.world import World
+
+
+def make_scene() -> tuple[World, Camera]:
+    a, b = Sphere(), Sphere()
+    a.set_transform(translation(-1.5, 0, 0))
+    b.set_transform(translation(1.5, 0, 0) * scaling(0.5, 0.5, 0.5))
+    camera = Camera(
+        12,
+        8,
+        math.pi / 2,
+        view_transform(point(0, 0, -5), point(0, 0, 0), vector(0, 1, 0)),
+    )
+    return World([a, b]), camera
+
+
+class TestCollectStats:
+    def test_disabled_by_default(self) -> None:
+        intersect = Ray.intersect
+        with stats.collect_stats():
+            assert Ray.intersect is not intersect
+        assert Ray.intersect is intersect
+        assert stats.active() is None
+
+    def test_intersections(self) -> None:
+        s = Sphere()
+        with stats.collect_stats() as collected:
+            Ray(point(0, 0, -5), vector(0, 0, 1)).intersect(s)
+            Ray(point(0, 2, -5), vector(0, 0, 1)).intersect(s)
+            Ray(point(0, 0, -5), vector(0, 0, 1)).nearest_hit(s)
+        assert collected.intersection_tests == 3
+        assert collected.hits == 2
+        assert collected.misses == 1
+        assert collected.intersections == 2
+
+    def test_inversions(self) -> None:
+        m = Matrix.identity()
+        s = Sphere()
+        with stats.collect_stats() as collected:
+            m.inverse()
+            s.set_transform(Matrix([2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 1]))
+        assert collected.inversions == 2
+
+    def test_nested(self) -> None:
+        s = Sphere()
+        ray = Ray(point(0, 0, -5), vector(0, 0, 1))
+        with stats.collect_stats() as outer:
+            ray.intersect(s)
+            with stats.collect_stats() as inner:
+                ray.intersect(s)
+            assert inner.intersection_tests == 1
+            assert stats.active() is outer
+        assert outer.intersection_tests == 2
+        assert outer.intersections == 2
+
+    def test_other_threads(self) -> None:
+        s = Sphere()
+        ray = Ray(point(0, 0, -5), vector(0, 0, 1))
+        original = Ray.intersect
+        started, finish = threading.Event(), threading.Event()
+        errors = []
+
+        def intersect() -> None:
+            try:
+                ray.intersect(s)
+                started.set()
+                finish.wait()
+                ray.intersect(s)
+            except Exception as e:
+                errors.append(e)
+
+        with stats.collect_stats() as collected:
+            thread = threading.Thread(target=intersect)
+            thread.start()
+            started.wait()
+            ray.intersect(s)
+        # The thread keeps intersecting after the block has exited.
+        finish.set()
+        thread.join()
+        assert not errors
+        assert collected.intersection_tests == 1
+        assert Ray.intersect is original
+
+    def test_concurrent_blocks(self) -> None:
+        s = Sphere()
+        ray = Ray(point(0, 0, -5), vector(0, 0, 1))
+        intersect = Ray.intersect
+        entered, exited = threading.Event(), threading.Event()
+        counts = {}
+
+        def collect() -> None:
+            with stats.collect_stats() as collected:
+                ray.intersect(s)
+                entered.set()
+                exited.wait()
+                ray.intersect(s)
+            counts["thread"] = collected.intersection_tests
+
+        thread = threading.Thread(target=collect)
+        thread.start()
+        entered.wait()
+        with stats.collect_stats() as collected:
+            for _ in range(3):
+                ray.intersect(s)
+        # The thread's block outlives this one and still counts its own work.
+        exited.set()
+        thread.join()
+        assert collected.intersection_tests == 3
+        assert counts["thread"] == 2
+        assert Ray.intersect is intersect
+
+
+class TestRenderStats:
+    def test_render(self) -> None:
+        world, camera = make_scene()
+        with stats.collect_stats() as collected:
+            canvas = render(world, camera, tile=4)
+
+        assert collected.rays == 12 * 8
+        assert len(collected.tiles) == 6
+        assert sum(t.intersection_tests for t in collected.tiles) == (
+            collected.intersection_tests
+        )
+        assert len(collected.pixel_cost) == 12 * 8
+        assert sum(collected.pixel_cost.values()) == collected.intersection_tests
+        assert canvas.buffer.tobytes() == render(world, camera).buffer.tobytes()
+
+    def test_report(self) -> None:
+        world, camera = make_scene()
+        with stats.collect_stats() as collected:
+            render(world, camera, tile=4)
+        report = json.loads(collected.to_json())
+        assert report["counters"]["rays"] == 96
+        assert report["counters"]["misses"] == collected.misses
+        assert len(report["tiles"]) == 6
+        assert report["tiles"][0]["rect"] == [0, 0, 4, 4]
+
+    def test_heatmap(self) -> None:
+        collected = stats.Stats()
+        collected.pixel_cost = {(0, 0): 0, (1, 0): 1, (0, 1): 2}
+        heatmap = collected.heatmap(2, 2)
+        assert heatmap.get(0, 0) == Colour(0, 0, 0)
+        assert heatmap.get(1, 0) == Colour(1, 0, 0)
+        assert heatmap.get(0, 1) == Colour(1, 1, 0)
+        assert heatmap.get(1, 1) == Colour(0, 0, 0)
+
+    def test_render_parallel(self) -> None:
+        world, camera = make_scene()
+        with stats.collect_stats() as serial:
+            render(world, camera, tile=4)
+        with stats.collect_stats() as parallel:
+            render_parallel(world, camera, workers=2, tile=4)
+        assert parallel.counters() == serial.counters()
+        assert parallel.pixel_cost == serial.pixel_cost
+        assert len(parallel.tiles) == 6
@@ -1,12 +1,15 @@
 import math
 
+from raycaster.matrix import FrozenMatrix, Matrix
 from raycaster.transformation import (
+    Transform,
     rotation_x,
     rotation_y,
     rotation_z,
     scaling,
     shearing,
     translation,
+    view_transform,
 )
 from raycaster.vector import point, vector
 
@@ -129,3 +132,109 @@ class TestTransformations:
 
         t = c * b * a
         assert t * p == point(15, 0, 7)
+
+    def test_view_transform_default(self) -> None:
+        t = view_transform(point(0, 0, 0), point(0, 0, -1), vector(0, 1, 0))
+        assert t == Matrix.identity()
+
+    def test_view_transform_positive_z(self) -> None:
+        t = view_transform(point(0, 0, 0), point(0, 0, 1), vector(0, 1, 0))
+        assert t == scaling(-1, 1, -1)
+
+    def test_view_transform_moves_world(self) -> None:
+        t = view_transform(point(0, 0, 8), point(0, 0, 0), vector(0, 1, 0))
+        assert t == translation(0, 0, -8)
+
+    def test_view_transform_arbitrary(self) -> None:
+        t = view_transform(point(1, 3, 2), point(4, -2, 8), vector(1, 1, 0))
+        # fmt: off
+        assert t.is_close(Matrix([
+            -0.50709, 0.50709,  0.67612, -2.36643,
+             0.76772, 0.60609,  0.12122, -2.82843,
+            -0.35857, 0.59761, -0.71714,  0.00000,
+             0.00000, 0.00000,  0.00000,  1.00000,
+        ]))
+        # fmt: on
+
+
+class TestTransformationCache:
+    def test_constructors_are_memoized(self) -> None:
+        info = translation.cache.info()  # type: ignore
+        a = translation(1.5, 2, 3)
+        b = translation(1.5, 2, 3)
+        assert a is b
+        assert translation.cache.info().hits > info.hits  # type: ignore
+
+        assert rotation_z(0.25) is rotation_z(0.25)
+        assert rotation_z(0.25) is not rotation_z(0.5)
+
+    def test_keyword_arguments(self) -> None:
+        assert translation(x=1, y=2, z=3) is translation(1, 2, 3)
+        assert shearing(1, 0, 0, 0, 0, 0) == shearing(
+            xy=1, xz=0, yx=0, yz=0, zx=0, zy=0
+        )
+        assert rotation_x(r=0.5) is rotation_x(0.5)
+
+    def test_constructors_are_frozen(self) -> None:
+        for m in (
+            translation(1, 2, 3),
+            scaling(1, 2, 3),
+            rotation_x(1),
+            rotation_y(1),
+            rotation_z(1),
+            shearing(1, 2, 3, 4, 5, 6),
+        ):
+            assert isinstance(m, FrozenMatrix)
+            hash(m)
+
+
+class TestTransform:
+    def test_identity(self) -> None:
+        t = Transform()
+        assert t.matrix == Matrix.identity()
+        assert t.inverse == Matrix.identity()
+
+    def test_from_matrix(self) -> None:
+        m = translation(1, 2, 3) * scaling(2, 2, 2)
+        t = Transform(m)
+        assert t.matrix == m
+        assert t.inverse == m.inverse()
+
+    def test_chain_order(self) -> None:
+        t = Transform().rotate_x(math.pi / 2).scale(5, 5, 5).translate(10, 5, 7)
+        assert t.matrix == translation(10, 5, 7) * scaling(5, 5, 5) * rotation_x(
+            math.pi / 2
+        )
+        assert t.matrix * point(1, 0, 1) == point(15, 0, 7)
+        assert t.inverse * point(15, 0, 7) == point(1, 0, 1)
+
+    def test_analytic_inverses(self) -> None:
+        chains = [
+            Transform().translate(5, -3, 2),
+            Transform().scale(2, 3, 4),
+            Transform().rotate_x(0.3),
+            Transform().rotate_y(-1.2),
+            Transform().rotate_z(2.5),
+            Transform().shear(1, 0.5, 0, 2, 0.25, 0),
+            Transform()
+            .shear(0.5, 0, 0, 0, 0, 0.3)
+            .rotate_y(0.7)
+            .scale(1, 0.5, 2)
+            .translate(-1, 4, 3)
+            .rotate_z(-0.4),
+        ]
+        for t in chains:
+            assert t.inverse.is_close(t.matrix.inverse())
+            assert (t.matrix * t.inverse).is_close(Matrix.identity())
+
+    def test_compose_and_invert(self) -> None:
+        a = Transform().rotate_y(0.5).translate(1, 2, 3)
+        b = Transform().scale(2, 4, 8)
+        c = a * b
+        assert c.matrix == a.matrix * b.matrix
+        assert c.inverse.is_close((a.matrix * b.matrix).inverse())
+
+        inv = c.inverted()
+        assert inv.matrix == c.inverse
+        assert inv.inverse == c.matrix
+        assert inv * c == Transform()
@@ -1,6 +1,9 @@
 import math
+from fractions import Fraction
 
-from raycaster.vector import Colour, Tuple, point, vector
+import pytest
+
+from raycaster.vector import Colour, Tuple, TupleArray, lerp, madd, point, vector
 
 
 class TestTuple:
@@ -132,6 +135,58 @@ class TestTuple:
         p = point(0.1234567, 1234.8765, -10.5)
         assert repr(p) == "point(x=0.12, y=1234.88, z=-10.50)"
 
+    def test_in_place_add_sub(self) -> None:
+        a = point(1, 2, 3)
+        b = a
+        a += vector(1, 1, 1)
+        assert a is b
+        assert a == point(2, 3, 4)
+
+        a -= vector(2, 3, 4)
+        assert a is b
+        assert a == point(0, 0, 0)
+
+    def test_in_place_mul(self) -> None:
+        a = vector(1, -2, 3)
+        b = a
+        a *= 2
+        assert a is b
+        assert a == vector(2, -4, 6)
+
+        a *= Fraction(1, 2)
+        assert a == vector(1, -2, 3)
+
+    def test_madd(self) -> None:
+        p = madd(point(2, 3, 4), vector(1, 0, -1), 2.5)
+        assert p == point(4.5, 3, 1.5)
+        assert type(p) is Tuple
+        assert type(madd(Colour(0, 0, 0), Colour(1, 1, 1), 0.5)) is Colour
+
+    def test_lerp(self) -> None:
+        a = point(0, 2, 4)
+        b = point(4, 2, 0)
+        assert lerp(a, b, 0) == a
+        assert lerp(a, b, 1) == b
+        assert lerp(a, b, 0.25) == point(1, 2, 3)
+
+    def test_results_are_floats(self) -> None:
+        a = point(1, 2, 3) + vector(1, 2, 3)
+        assert all(type(el) is float for el in a)
+        a = vector(1, 2, 3) * 2
+        assert all(type(el) is float for el in a)
+
+    def test_numpy_scalars(self) -> None:
+        np = pytest.importorskip("numpy")
+        half = np.float32(0.5)
+        a = vector(1, 2, 3)
+        b = vector(4, 5, 6)
+        results = [a * half, a / half, madd(a, b, half), lerp(a, b, half)]
+        a *= half
+        results.append(a)
+        for t in results:
+            assert all(type(el) is float for el in t)
+        assert repr(vector(1, 2, 3) * np.float64(2)) == repr(vector(2, 4, 6))
+
 
 class TestColour:
     def test_add_colour(self) -> None:
@@ -156,3 +211,86 @@ class TestColour:
     def test_repr(self) -> None:
         c = Colour(0, 0.6, 0.7)
         assert repr(c) == "Colour(r=0.00, g=0.60, b=0.70)"
+
+    def test_in_place_mul_colour(self) -> None:
+        a = Colour(1, 0.2, 0.4)
+        b = a
+        a *= Colour(0.9, 1, 0.1)
+        assert a is b
+        assert a == Colour(0.9, 0.2, 0.04)
+
+        a *= 2
+        assert a == Colour(1.8, 0.4, 0.08)
+
+
+class TestTupleArray:
+    def test_create(self) -> None:
+        a = TupleArray.from_tuples([point(1, 2, 3), vector(4, 5, 6)])
+        assert len(a) == 2
+        assert a.data.tolist() == [1, 2, 3, 1, 4, 5, 6, 0]
+        assert a[0] == point(1, 2, 3)
+        assert a[-1] == vector(4, 5, 6)
+        assert list(a) == [point(1, 2, 3), vector(4, 5, 6)]
+        assert len(TupleArray()) == 0
+
+        with pytest.raises(IndexError):
+            a[2]
+
+        with pytest.raises(ValueError):
+            TupleArray([1, 2, 3])
+
+    def test_colours(self) -> None:
+        a = TupleArray.from_tuples([Colour(1, 0.5, 0), Colour(0, 0, 1)])
+        assert a.cls is Colour
+        assert isinstance(a[0], Colour)
+        assert (a * 0.5)[0] == Colour(0.5, 0.25, 0)
+
+    def test_setitem(self) -> None:
+        a = TupleArray.from_tuples([point(1, 2, 3), vector(4, 5, 6)])
+        a[1] = point(7, 8, 9)
+        assert a[1] == point(7, 8, 9)
+
+        # Indexing returns a copy, so changing it leaves the array alone.
+        p = a[0]
+        p += vector(1, 1, 1)
+        assert a[0] == point(1, 2, 3)
+
+    def test_add_sub(self) -> None:
+        a = TupleArray.from_tuples([point(1, 2, 3), point(-1, 0, 1)])
+        b = TupleArray.from_tuples([vector(1, 1, 1), vector(2, 2, 2)])
+        assert list(a + b) == [point(2, 3, 4), point(1, 2, 3)]
+        assert list(a - b) == [point(0, 1, 2), point(-3, -2, -1)]
+        assert list(a + vector(0, 0, 1)) == [point(1, 2, 4), point(-1, 0, 2)]
+        assert list(-b) == [vector(-1, -1, -1), vector(-2, -2, -2)]
+
+        with pytest.raises(ValueError):
+            a + TupleArray.from_tuples([vector(1, 1, 1)])
+
+        with pytest.raises(TypeError):
+            a + 1  # type: ignore
+
+    def test_mul_div(self) -> None:
+        a = TupleArray.from_tuples([vector(1, -2, 3), vector(2, 4, 6)])
+        assert list(a * 2) == [vector(2, -4, 6), vector(4, 8, 12)]
+        assert list(a / 2) == [vector(0.5, -1, 1.5), vector(1, 2, 3)]
+        assert list(a * [1, 0.5]) == [vector(1, -2, 3), vector(1, 2, 3)]
+
+        with pytest.raises(ValueError):
+            a * [1, 2, 3]
+
+    def test_vector_ops(self) -> None:
+        vectors = [vector(1, 2, 3), vector(4, 0, 0), vector(-2, 1, 5)]
+        others = [vector(2, 3, 4), vector(0, 1, 0), vector(1, 1, 1)]
+        a = TupleArray.from_tuples(vectors)
+        b = TupleArray.from_tuples(others)
+
+        assert a.dot(b).tolist() == [v.dot(o) for v, o in zip(vectors, others)]
+        assert a.magnitude().tolist() == [v.magnitude() for v in vectors]
+        assert list(a.normalize()) == [v.normalize() for v in vectors]
+        assert list(a.cross(b)) == [v.cross(o) for v, o in zip(vectors, others)]
+
+    def test_is_close(self) -> None:
+        a = TupleArray.from_tuples([vector(1, 2, 3)])
+        assert a.is_close(TupleArray.from_tuples([vector(1, 2, 3.000001)]))
+        assert not a.is_close(TupleArray.from_tuples([vector(1, 2, 3.1)]))
+        assert not a.is_close(TupleArray())
@@ -0,0 +1,148 @@
+import random
+
+from raycaster.bounds import Bounds
+from raycaster.ray import Intersections, Ray, Sphere
+from raycaster.transformation import scaling, translation
+from raycaster.vector import point, vector
+from raycaster.world import World, build_bvh
+
+
+def random_spheres(n: int) -> list[Sphere]:
+    rng = random.Random(0)
+    shapes = []
+    for _ in range(n):
+        s = Sphere()
+        s.set_transform(
+            translation(rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(0, 40))
+            * scaling(*[rng.uniform(0.2, 2)] * 3)
+        )
+        shapes.append(s)
+    return shapes
+
+
+class TestWorld:
+    def test_sphere_bounds(self) -> None:
+        s = Sphere()
+        assert s.bounds == Bounds(-1, -1, -1, 1, 1, 1)
+        s.set_transform(translation(1, 2, 3) * scaling(2, 2, 2))
+        assert s.bounds == Bounds(-1, 0, 1, 3, 4, 5)
+
+    def test_empty_world(self) -> None:
+        w = World()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert w.intersect(r).count == 0
+
+    def test_intersect(self) -> None:
+        s1 = Sphere()
+        s2 = Sphere()
+        s2.set_transform(scaling(0.5, 0.5, 0.5))
+        w = World([s1, s2])
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        xs = w.intersect(r)
+        assert [i.t for i in xs] == [4, 4.5, 5.5, 6]
+        assert [i.obj for i in xs] == [s1, s2, s2, s1]
+
+    def test_add_rebuilds(self) -> None:
+        w = World()
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert w.intersect(r).count == 0
+        w.add(Sphere())
+        assert w.intersect(r).count == 2
+
+    def test_invalidate_after_moving_shape(self) -> None:
+        s = Sphere()
+        w = World([s])
+        r = Ray(point(10, 0, -5), vector(0, 0, 1))
+        assert w.nearest_hit(r) is None
+
+        s.set_transform(translation(10, 0, 0))
+        w.invalidate()
+        assert w.nearest_hit(r) == (4, s)
+        assert r.nearest_hit(s) == (4, s)
+
+    def test_matches_linear_scan(self) -> None:
+        shapes = random_spheres(300)
+        w = World(shapes)
+        rng = random.Random(1)
+        for _ in range(100):
+            r = Ray(
+                point(rng.uniform(-20, 20), rng.uniform(-20, 20), -10),
+                vector(rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5), 1),
+            )
+            xs = []
+            for s in shapes:
+                xs.extend(r.intersect(s).intersections)
+            expected = Intersections(*xs)
+            assert sorted((i.t, id(i.obj)) for i in w.intersect(r)) == sorted(
+                (i.t, id(i.obj)) for i in expected
+            )
+
+    def test_nearest_hit(self) -> None:
+        s1 = Sphere()
+        s2 = Sphere()
+        s2.set_transform(translation(0, 0, -3) * scaling(0.5, 0.5, 0.5))
+        w = World([s1, s2])
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert r.nearest_hit(w) == (1.5, s2)
+        assert r.nearest_hit(w, t_min=3) == (4, s1)
+        assert r.nearest_hit(w, t_max=1.5) is None
+        assert Ray(point(0, 2, -5), vector(0, 0, 1)).nearest_hit(w) is None
+
+    def test_nearest_hit_matches_intersect(self) -> None:
+        w = World(random_spheres(300))
+        rng = random.Random(2)
+        for _ in range(200):
+            r = Ray(
+                point(rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(-10, 40)),
+                vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)),
+            )
+            hit = w.intersect(r).hit()
+            if hit is None:
+                assert r.nearest_hit(w) is None
+            else:
+                assert r.nearest_hit(w) == (hit.t, hit.obj)
+
+    def test_occluded(self) -> None:
+        s1 = Sphere()
+        s2 = Sphere()
+        s2.set_transform(translation(0, 0, -3) * scaling(0.5, 0.5, 0.5))
+        w = World([s1, s2])
+        r = Ray(point(0, 0, -5), vector(0, 0, 1))
+        assert w.occluded(r)
+        assert w.occluded(r, 2)
+        assert not w.occluded(r, 1.5)
+        assert not w.occluded(Ray(point(0, 2, -5), vector(0, 0, 1)))
+        assert not World().occluded(r)
+
+    def test_occluded_matches_nearest_hit(self) -> None:
+        w = World(random_spheres(300))
+        rng = random.Random(3)
+        for _ in range(200):
+            r = Ray(
+                point(rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(-10, 40)),
+                vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)),
+            )
+            distance = rng.uniform(1, 30)
+            assert w.occluded(r, distance) == (
+                r.nearest_hit(w, 0, distance) is not None
+            )
+
+    def test_bvh_structure(self) -> None:
+        shapes = random_spheres(100)
+        root = build_bvh(shapes, max_leaf_size=4)
+
+        leaves = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf():
+                leaves.append(node)
+            else:
+                stack.extend((node.left, node.right))
+                for child in (node.left, node.right):
+                    assert node.bounds.union(child.bounds) == node.bounds
+
+        assert sorted(id(s) for leaf in leaves for s in leaf.shapes) == sorted(
+            id(s) for s in shapes
+        )
+        assert len(leaves) > 10